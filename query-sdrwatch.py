@@ -1,368 +1,547 @@
-#!/usr/bin/env python3
-"""
-query_sdrwatch.py — quick CLI to inspect an SDRWatch SQLite database
-
-Updated to match the upgraded sdrwatch schema:
-- scans table now uses columns: fft, avg (not fft_size)
-- fields kept: t_start_utc, t_end_utc, f_start_hz, f_stop_hz, step_hz, samp_rate, driver, device
-- detections: f_low_hz, f_center_hz, f_high_hz, peak_db, noise_db, snr_db, service, region, notes
-- baseline: bin_hz, ema_occ, ema_power_db, last_seen_utc, total_obs, hits
-
-No external dependencies. Prints tidy tables to stdout and supports CSV export.
-
-Usage examples:
-  # List recent scans
-  python3 query_sdrwatch.py scans --limit 10
-
-  # Show detections from latest scan
-  python3 query_sdrwatch.py detections --limit 20
-
-  # Show detections with filters
-  python3 query_sdrwatch.py detections --min-snr 8 --service ISM --since "2025-08-17T00:00:00Z"
-
-  # Baseline around 95 MHz ±500 kHz
-  python3 query_sdrwatch.py baseline --center 95 --span-khz 500
-
-  # Top detections by SNR
-  python3 query_sdrwatch.py top --limit 15
-
-  # Summary roll‑up
-  python3 query_sdrwatch.py summary
-
-  # Export detections to CSV
-  python3 query_sdrwatch.py export --outfile detections.csv --min-snr 6
-"""
-
-from __future__ import annotations
-import argparse
-import csv
-import os
-import sqlite3
-import sys
-from typing import Any, Optional, Sequence, Tuple, List
-
-# ----------------------------
-# Helpers
-# ----------------------------
-
-def err(msg: str) -> None:
-    print(f"[error] {msg}", file=sys.stderr)
-
-
-def open_db(path: str) -> sqlite3.Connection:
-    if not os.path.exists(path):
-        err(f"Database not found: {path}")
-        sys.exit(2)
-    con = sqlite3.connect(path)
-    con.row_factory = sqlite3.Row
-    return con
-
-
-def fmt_table(rows, headers=None, max_width=28):
-    if not rows:
-        return "(no rows)"
-    if headers is None:
-        headers = list(rows[0].keys())
-    cols = list(headers)
-
-    def get_val(r, k):
-        try:
-            return r[k]
-        except Exception:
-            return ""
-
-    data = [[str(get_val(r, c)) for c in cols] for r in rows]
-
-    def clip(s: str) -> str:
-        s = s if s is not None else ""
-        if len(s) > max_width:
-            return s[: max_width - 1] + "…"
-        return s
-
-    data = [[clip(x) for x in row] for row in data]
-    widths = [max(len(str(h)), max(len(str(row[i])) for row in data)) for i, h in enumerate(cols)]
-    sep = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
-    out = [sep]
-    out.append("| " + " | ".join(str(h).ljust(widths[i]) for i, h in enumerate(cols)) + " |")
-    out.append(sep)
-    for row in data:
-        out.append("| " + " | ".join(str(row[i]).ljust(widths[i]) for i in range(len(cols))) + " |")
-    out.append(sep)
-    return "\n".join(out)
-
-
-def to_hz(mhz: Optional[float]) -> Optional[int]:
-    return int(mhz * 1e6) if mhz is not None else None
-
-
-def between_clause(col: str, lo: Optional[int], hi: Optional[int]) -> Tuple[str, list]:
-    if lo is not None and hi is not None:
-        return f"{col} BETWEEN ? AND ?", [lo, hi]
-    elif lo is not None:
-        return f"{col} >= ?", [lo]
-    elif hi is not None:
-        return f"{col} <= ?", [hi]
-    else:
-        return "", []
-
-# ----------------------------
-# Commands
-# ----------------------------
-
-def cmd_scans(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    q = (
-        "SELECT id, t_start_utc, t_end_utc, "
-        "ROUND(f_start_hz/1e6, 6) AS f_start_MHz, "
-        "ROUND(f_stop_hz/1e6, 6) AS f_stop_MHz, "
-        "ROUND(step_hz/1e6, 6) AS step_MHz, "
-        "samp_rate AS samp_rate_Hz, fft AS fft, avg AS avg, driver, device "
-        "FROM scans ORDER BY id DESC LIMIT ?"
-    )
-    rows = con.execute(q, (args.limit,)).fetchall()
-    print(fmt_table(rows))
-
-
-def _latest_scan_id(con: sqlite3.Connection) -> Optional[int]:
-    row = con.execute("SELECT id FROM scans ORDER BY id DESC LIMIT 1").fetchone()
-    return int(row[0]) if row else None
-
-
-def cmd_detections(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    params: List[Any] = []
-    where: List[str] = []
-
-    if args.scan_id is None and not args.all_scans:
-        sid = _latest_scan_id(con)
-        if sid is None:
-            print("(no scans)")
-            return
-        where.append("scan_id = ?")
-        params.append(sid)
-    elif args.scan_id is not None:
-        where.append("scan_id = ?")
-        params.append(args.scan_id)
-
-    if args.min_snr is not None:
-        where.append("snr_db >= ?")
-        params.append(args.min_snr)
-
-    if args.service:
-        where.append("service LIKE ?")
-        params.append(f"%{args.service}%")
-
-    if args.region:
-        where.append("region LIKE ?")
-        params.append(f"%{args.region}%")
-
-    if args.since:
-        where.append("time_utc >= ?")
-        params.append(args.since)
-
-    if args.mhz_min is not None or args.mhz_max is not None:
-        clause, binds = between_clause("f_center_hz", to_hz(args.mhz_min), to_hz(args.mhz_max))
-        if clause:
-            where.append(clause)
-            params.extend(binds)
-
-    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
-
-    q = (
-        "SELECT time_utc, scan_id, "
-        "ROUND(f_low_hz/1e6,6) AS f_low_MHz, "
-        "ROUND(f_center_hz/1e6,6) AS f_center_MHz, "
-        "ROUND(f_high_hz/1e6,6) AS f_high_MHz, "
-        "ROUND(peak_db,1) AS peak_dB, ROUND(noise_db,1) AS noise_dB, ROUND(snr_db,1) AS SNR_dB, "
-        "COALESCE(NULLIF(service,''),'—') AS service, COALESCE(NULLIF(region,''),'') AS region, "
-        "COALESCE(NULLIF(notes,''),'') AS notes "
-        f"FROM detections{where_sql} "
-        "ORDER BY time_utc DESC LIMIT ?"
-    )
-    params2 = params + [args.limit]
-    rows = con.execute(q, params2).fetchall()
-
-    if args.csv:
-        writer = csv.writer(sys.stdout)
-        writer.writerow(rows[0].keys() if rows else [])
-        for r in rows:
-            writer.writerow([r[k] for k in r.keys()])
-    else:
-        print(fmt_table(rows))
-
-
-def cmd_baseline(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    params: List[Any] = []
-    where: List[str] = []
-
-    lo_hz: Optional[int] = None
-    hi_hz: Optional[int] = None
-
-    if args.center is not None:
-        span_hz = int((args.span_khz or 100) * 1e3)
-        c_hz = to_hz(args.center)
-        if c_hz is not None:
-            lo_hz = c_hz - span_hz
-            hi_hz = c_hz + span_hz
-        else:
-            lo_hz = None
-            hi_hz = None
-    else:
-        lo_hz = to_hz(args.mhz_min) if args.mhz_min is not None else None
-        hi_hz = to_hz(args.mhz_max) if args.mhz_max is not None else None
-
-    clause, binds = between_clause("bin_hz", lo_hz, hi_hz)
-    if clause:
-        where.append(clause)
-        params.extend(binds)
-
-    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
-
-    q = (
-        "SELECT ROUND(bin_hz/1e6,6) AS MHz, "
-        "ROUND(ema_occ,3) AS occ, ROUND(ema_power_db,1) AS power_dB, last_seen_utc, total_obs, hits "
-        f"FROM baseline{where_sql} ORDER BY bin_hz LIMIT ?"
-    )
-    params.append(args.limit)
-    rows = con.execute(q, params).fetchall()
-    print(fmt_table(rows))
-
-
-def cmd_top(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    q = (
-        "SELECT ROUND(f_center_hz/1e6,6) AS MHz, ROUND(snr_db,1) AS SNR_dB, time_utc, "
-        "COALESCE(NULLIF(service,''),'—') AS service, COALESCE(NULLIF(region,''),'') AS region "
-        "FROM detections ORDER BY snr_db DESC LIMIT ?"
-    )
-    rows = con.execute(q, (args.limit,)).fetchall()
-    print(fmt_table(rows))
-
-
-def cmd_summary(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    total_scans = con.execute("SELECT COUNT(*) FROM scans").fetchone()[0]
-    total_det = con.execute("SELECT COUNT(*) FROM detections").fetchone()[0]
-    total_bins = con.execute("SELECT COUNT(*) FROM baseline").fetchone()[0]
-
-    latest = con.execute(
-        "SELECT id, t_start_utc, t_end_utc, ROUND(f_start_hz/1e6,3), ROUND(f_stop_hz/1e6,3), fft, avg, samp_rate "
-        "FROM scans ORDER BY id DESC LIMIT 1"
-    ).fetchone()
-
-    by_service = con.execute(
-        "SELECT COALESCE(NULLIF(service,''),'(unknown)') AS service, COUNT(*) AS count "
-        "FROM detections GROUP BY COALESCE(NULLIF(service,''),'(unknown)') "
-        "ORDER BY count DESC LIMIT 10"
-    ).fetchall()
-
-    print("== Overview ==")
-    print(f"scans: {total_scans}  detections: {total_det}  baseline bins: {total_bins}")
-    if latest:
-        print(
-            f"latest scan id={latest[0]}  {latest[1]} → {latest[2]}  range={latest[3]}–{latest[4]} MHz  "
-            f"fft={latest[5]} avg={latest[6]} samp_rate={latest[7]} Hz"
-        )
-    print()
-    print("== Top services ==")
-    print(fmt_table(by_service, headers=["service", "count"]))
-
-    snr_hist = con.execute(
-        "SELECT CAST((snr_db/3) AS INT)*3 AS snr_dB_bucket, COUNT(*) AS count FROM detections GROUP BY snr_dB_bucket ORDER BY snr_dB_bucket"
-    ).fetchall()
-    if snr_hist:
-        print()
-        print("== SNR histogram (3 dB buckets) ==")
-        print(fmt_table(snr_hist, headers=["snr_dB_bucket", "count"]))
-
-
-def cmd_export(con: sqlite3.Connection, args: argparse.Namespace) -> None:
-    # Reuse detection filters and dump to CSV file
-    ns = argparse.Namespace(
-        scan_id=args.scan_id,
-        all_scans=args.all_scans,
-        min_snr=args.min_snr,
-        service=args.service,
-        region=args.region,
-        since=args.since,
-        mhz_min=args.mhz_min,
-        mhz_max=args.mhz_max,
-        limit=args.limit,
-        csv=True,
-    )
-    with open(args.outfile, "w", newline="", encoding="utf-8") as f:
-        old = sys.stdout
-        sys.stdout = f
-        try:
-            cmd_detections(con, ns)
-        finally:
-            sys.stdout = old
-    print(f"wrote {args.outfile}")
-
-# ----------------------------
-# Main
-# ----------------------------
-
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Inspect an SDRWatch SQLite database")
-    p.add_argument("--db", default="sdrwatch.db", help="Path to sdrwatch.db")
-
-    sub = p.add_subparsers(dest="cmd", required=True)
-
-    p_scans = sub.add_parser("scans", help="List scans")
-    p_scans.add_argument("--limit", type=int, default=10)
-    p_scans.set_defaults(func=cmd_scans)
-
-    p_det = sub.add_parser("detections", help="List detections (defaults to latest scan)")
-    p_det.add_argument("--scan-id", type=int)
-    p_det.add_argument("--all-scans", action="store_true", help="Do not restrict to latest scan")
-    p_det.add_argument("--min-snr", type=float)
-    p_det.add_argument("--service", type=str)
-    p_det.add_argument("--region", type=str)
-    p_det.add_argument("--since", type=str, help="ISO-8601 lower bound, e.g., 2025-08-17T00:00:00Z")
-    p_det.add_argument("--mhz-min", type=float)
-    p_det.add_argument("--mhz-max", type=float)
-    p_det.add_argument("--limit", type=int, default=20)
-    p_det.add_argument("--csv", action="store_true", help="Output CSV to stdout")
-    p_det.set_defaults(func=cmd_detections)
-
-    p_base = sub.add_parser("baseline", help="Show baseline bins in a frequency window")
-    g = p_base.add_mutually_exclusive_group(required=False)
-    g.add_argument("--center", type=float, help="Center frequency in MHz")
-    p_base.add_argument("--span-khz", type=float, default=500.0, help="Half-span around center in kHz")
-    g.add_argument("--mhz-min", type=float, help="Lower bound in MHz")
-    p_base.add_argument("--mhz-max", type=float, help="Upper bound in MHz")
-    p_base.add_argument("--limit", type=int, default=200)
-    p_base.set_defaults(func=cmd_baseline)
-
-    p_top = sub.add_parser("top", help="Top detections by SNR")
-    p_top.add_argument("--limit", type=int, default=10)
-    p_top.set_defaults(func=cmd_top)
-
-    p_sum = sub.add_parser("summary", help="Database summary")
-    p_sum.set_defaults(func=cmd_summary)
-
-    p_exp = sub.add_parser("export", help="Export detections to CSV (respects detection filters)")
-    p_exp.add_argument("--outfile", required=True)
-    p_exp.add_argument("--scan-id", type=int)
-    p_exp.add_argument("--all-scans", action="store_true")
-    p_exp.add_argument("--min-snr", type=float)
-    p_exp.add_argument("--service", type=str)
-    p_exp.add_argument("--region", type=str)
-    p_exp.add_argument("--since", type=str)
-    p_exp.add_argument("--mhz-min", type=float)
-    p_exp.add_argument("--mhz-max", type=float)
-    p_exp.add_argument("--limit", type=int, default=100000)
-    p_exp.set_defaults(func=cmd_export)
-
-    return p
-
-
-def main(argv: Optional[Sequence[str]] = None) -> None:
-    p = build_parser()
-    args = p.parse_args(argv)
-    con = open_db(args.db)
-    try:
-        args.func(con, args)
-    finally:
-        con.close()
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+query_sdrwatch.py — quick CLI to inspect an SDRWatch SQLite database
+
+Updated to match the upgraded sdrwatch schema:
+- scans table now uses columns: fft, avg (not fft_size)
+- fields kept: t_start_utc, t_end_utc, f_start_hz, f_stop_hz, step_hz, samp_rate, driver, device
+- detections: f_low_hz, f_center_hz, f_high_hz, peak_db, noise_db, snr_db, service, region, notes
+- baseline: bin_hz, ema_occ, ema_power_db, last_seen_utc, total_obs, hits
+
+No external dependencies. Prints tidy tables to stdout and supports CSV export.
+
+Usage examples:
+  # List recent scans
+  python3 query_sdrwatch.py scans --limit 10
+
+  # Show detections from latest scan
+  python3 query_sdrwatch.py detections --limit 20
+
+  # Show detections with filters
+  python3 query_sdrwatch.py detections --min-snr 8 --service ISM --since "2025-08-17T00:00:00Z"
+
+  # Baseline around 95 MHz ±500 kHz
+  python3 query_sdrwatch.py baseline --center 95 --span-khz 500
+
+  # Top detections by SNR
+  python3 query_sdrwatch.py top --limit 15
+
+  # Summary roll‑up
+  python3 query_sdrwatch.py summary
+
+  # Export detections to CSV
+  python3 query_sdrwatch.py export --outfile detections.csv --min-snr 6
+"""
+
+from __future__ import annotations
+import argparse
+import io
+import os
+import sqlite3
+import sys
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple, List
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def err(msg: str) -> None:
+    print(f"[error] {msg}", file=sys.stderr)
+
+
+# Set from --explain in main(); when on, every query prints its plan first so
+# a missing index (silent full-scan fallback) is visible immediately.
+EXPLAIN = False
+
+
+def query(con: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+    if EXPLAIN:
+        for row in con.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall():
+            print(f"[plan] {row[-1]}", file=sys.stderr)
+    return con.execute(sql, params)
+
+
+def ensure_indexes(con: sqlite3.Connection) -> None:
+    """Create the indexes the hot queries rely on (idempotent).
+
+    detections is filtered by scan_id/snr_db/service and ordered by
+    time_utc/snr_db; baseline is range-scanned on bin_hz. Without these,
+    every invocation pays a full table scan.
+    """
+    try:
+        con.execute("BEGIN")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_det_scan_time ON detections(scan_id, time_utc DESC)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_det_snr ON detections(snr_db DESC)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_det_center ON detections(f_center_hz)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_det_service ON detections(service)")
+        con.execute("CREATE INDEX IF NOT EXISTS idx_baseline_bin ON baseline(bin_hz)")
+        # Expression index so the summary SNR histogram GROUP BY is served
+        # in index order instead of sorting the whole table.
+        con.execute("CREATE INDEX IF NOT EXISTS idx_det_snr_bucket ON detections(CAST(snr_db/3 AS INT))")
+        con.commit()
+    except sqlite3.OperationalError:
+        # Read-only DB or locked by the scanner; queries still work, just slower.
+        con.rollback()
+
+
+def open_db_ro(path: str) -> sqlite3.Connection:
+    """Read-only connection; safe to open several for parallel readers."""
+    con = sqlite3.connect(
+        f"file:{os.path.abspath(path)}?mode=ro", uri=True, cached_statements=256
+    )
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA mmap_size=268435456")
+    con.execute("PRAGMA cache_size=-262144")
+    con.execute("PRAGMA temp_store=MEMORY")
+    return con
+
+
+def open_db(path: str) -> sqlite3.Connection:
+    if not os.path.exists(path):
+        err(f"Database not found: {path}")
+        sys.exit(2)
+    # Best-effort maintenance on a short-lived writable handle: WAL so readers
+    # don't block the scanner, plus the query indexes.
+    try:
+        rw = sqlite3.connect(path)
+        rw.execute("PRAGMA journal_mode=WAL")
+        ensure_indexes(rw)
+        rw.close()
+    except sqlite3.Error:
+        pass
+    # Actual queries run on a read-only connection: no lock contention with a
+    # running scan, mmap'd pages instead of read() syscalls, and a large page
+    # cache for the full-table summaries.
+    # sqlite3 caches prepared statements per connection keyed on exact SQL
+    # text; bump the cache and keep query text stable (module-level constants,
+    # fixed placeholder shapes) so repeat invocations skip re-parsing.
+    con = open_db_ro(path)
+    if os.environ.get("SDRWATCH_DEBUG") == "1":
+        # Canned plan check: warn if the hot detections query stopped using an
+        # index (e.g. after a schema change dropped one).
+        plan = con.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM detections WHERE scan_id = 1 ORDER BY time_utc DESC LIMIT 1"
+        ).fetchall()
+        if not any("USING INDEX" in str(row[-1]) for row in plan):
+            err("detections query is not using an index; run with --explain to inspect plans")
+    return con
+
+
+def _hz_to_mhz(v):
+    try:
+        return round(v / 1e6, 6)
+    except TypeError:
+        return v
+
+
+@lru_cache(maxsize=32)
+def _table_chrome(cols: Tuple[str, ...], widths: Tuple[int, ...]) -> Tuple[str, str, str]:
+    """Separator, rendered header row, and row template for a table shape.
+
+    Memoized: cmd_summary renders several fixed-header tables per run (and
+    monitoring loops re-invoke with identical shapes), so the string builds
+    happen once per shape.
+    """
+    # One row template with the widths baked in: a single format() call per
+    # row instead of per-cell ljust + join allocations.
+    sep = "+" + "+".join("-" * (w + 2) for w in widths) + "+\n"
+    tmpl = "| " + " | ".join("{:<%d}" % w for w in widths) + " |\n"
+    return sep, tmpl.format(*cols), tmpl
+
+
+def fmt_table(rows, headers=None, max_width=28, null_display=None):
+    if not rows:
+        return "(no rows)"
+    if headers is None:
+        headers = list(rows[0].keys())
+    cols = list(headers)
+
+    # Queries select raw integer Hz; convert to MHz here so SQLite only does
+    # filtering and the division runs for the <= --limit rows actually printed.
+    # samp_rate_Hz is deliberately left in Hz.
+    formatters = {
+        c: _hz_to_mhz
+        for c in cols
+        if c.lower().endswith("_hz") and c.lower() != "samp_rate_hz"
+    }
+    display = [c[:-3] + "_MHz" if c in formatters else c for c in cols]
+
+    # Resolve cell accessors once per table instead of try/except per cell:
+    # sqlite3.Row indexes by name in C; plain tuples index positionally.
+    first = rows[0]
+    if isinstance(first, sqlite3.Row):
+        present = set(first.keys())
+        getters = [
+            (lambda r, k=c: r[k]) if c in present else (lambda r: "") for c in cols
+        ]
+    else:
+        getters = [
+            (lambda r, j=i: r[j] if j < len(r) else "") for i in range(len(cols))
+        ]
+
+    # Single pass: stringify, clip, and track running column widths together.
+    clip_at = max_width - 1
+    widths = [len(str(h)) for h in display]
+    data: List[List[str]] = []
+    for r in rows:
+        out_row = []
+        for i, c in enumerate(cols):
+            v = getters[i](r)
+            if c in formatters:
+                v = formatters[c](v)
+            # Display defaults applied here (for <= limit rows) instead of
+            # per-row COALESCE/NULLIF in the SQL VM.
+            if null_display and c in null_display and (v is None or v == ""):
+                v = null_display[c]
+            s = "" if v is None else str(v)
+            if len(s) > max_width:
+                s = s[:clip_at] + "…"
+            if len(s) > widths[i]:
+                widths[i] = len(s)
+            out_row.append(s)
+        data.append(out_row)
+    cols = display
+    sep, header, tmpl = _table_chrome(tuple(cols), tuple(widths))
+    buf = io.StringIO()
+    buf.write(sep)
+    buf.write(header)
+    buf.write(sep)
+    for row in data:
+        buf.write(tmpl.format(*row))
+    buf.write(sep)
+    return buf.getvalue().rstrip("\n")
+
+
+def to_hz(mhz: Optional[float]) -> Optional[int]:
+    # Scale via Decimal on the float's shortest repr rather than float
+    # multiply+truncate: avoids off-by-one Hz at values like 95.1 MHz, and the
+    # integer bind keeps SQLite's BETWEEN comparator on the integer path.
+    if mhz is None:
+        return None
+    return int(Decimal(str(mhz)) * 1_000_000)
+
+
+def between_clause(col: str, lo: Optional[int], hi: Optional[int]) -> Tuple[str, list]:
+    if lo is not None and hi is not None:
+        return f"{col} BETWEEN ? AND ?", [lo, hi]
+    elif lo is not None:
+        return f"{col} >= ?", [lo]
+    elif hi is not None:
+        return f"{col} <= ?", [hi]
+    else:
+        return "", []
+
+# ----------------------------
+# Commands
+# ----------------------------
+
+# Fixed query text as module constants so the per-connection statement cache
+# hits on every call (see open_db).
+SQL_SCANS = (
+    "SELECT id, t_start_utc, t_end_utc, "
+    "f_start_hz, f_stop_hz, step_hz, "
+    "samp_rate AS samp_rate_Hz, fft AS fft, avg AS avg, driver, device "
+    "FROM scans ORDER BY id DESC LIMIT ?"
+)
+
+SQL_LATEST_SCAN_ID = "SELECT id FROM scans ORDER BY id DESC LIMIT 1"
+
+SQL_TOP = (
+    "SELECT f_center_hz, ROUND(snr_db,1) AS SNR_dB, time_utc, service, region "
+    # Qualified sort column: the bare name would resolve to the SNR_dB
+    # output alias (case-insensitively), making SQLite sort the rounded
+    # expression with a temp b-tree instead of walking idx_det_snr.
+    "FROM detections ORDER BY detections.snr_db DESC LIMIT ?"
+)
+
+# Display defaults for empty/NULL text columns, applied in fmt_table.
+NULL_DISPLAY = {"service": "—", "region": "", "notes": ""}
+
+
+def cmd_scans(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    rows = query(con, SQL_SCANS, (args.limit,)).fetchall()
+    print(fmt_table(rows))
+
+
+def cmd_detections(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    params: List[Any] = []
+    where: List[str] = []
+
+    if args.scan_id is None and not args.all_scans:
+        # Correlated subquery instead of a separate latest-scan round-trip;
+        # the id lookup is O(1) on the implicit PK.
+        where.append(f"scan_id = ({SQL_LATEST_SCAN_ID})")
+    elif args.scan_id is not None:
+        where.append("scan_id = ?")
+        params.append(args.scan_id)
+
+    if args.min_snr is not None:
+        where.append("snr_db >= ?")
+        params.append(args.min_snr)
+
+    if args.service:
+        # Exact match by default so idx_det_service is usable; --service-contains
+        # opts into the (unindexable) substring scan.
+        if getattr(args, "service_contains", False):
+            where.append("service LIKE ?")
+            params.append(f"%{args.service}%")
+        else:
+            where.append("service = ?")
+            params.append(args.service)
+
+    if args.region:
+        if getattr(args, "region_contains", False):
+            where.append("region LIKE ?")
+            params.append(f"%{args.region}%")
+        else:
+            where.append("region = ?")
+            params.append(args.region)
+
+    if args.since:
+        where.append("time_utc >= ?")
+        params.append(args.since)
+
+    if args.mhz_min is not None or args.mhz_max is not None:
+        clause, binds = between_clause("f_center_hz", to_hz(args.mhz_min), to_hz(args.mhz_max))
+        if clause:
+            where.append(clause)
+            params.extend(binds)
+
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+
+    q = (
+        "SELECT time_utc, scan_id, "
+        "f_low_hz, f_center_hz, f_high_hz, "
+        "ROUND(peak_db,1) AS peak_dB, ROUND(noise_db,1) AS noise_dB, ROUND(snr_db,1) AS SNR_dB, "
+        "service, region, notes "
+        f"FROM detections{where_sql} "
+        "ORDER BY time_utc DESC LIMIT ?"
+    )
+    params2 = params + [args.limit]
+    cur = query(con, q, params2)
+
+    if args.csv:
+        import csv  # deferred: only the CSV paths pay the import
+
+        # Drain in arraysize-sized batches: each fetchmany crosses the C
+        # boundary once per 4096 rows, and writerows keeps the sqlite3.Row ->
+        # tuple conversion in C with no intermediate full list.
+        cur.arraysize = 4096
+        writer = csv.writer(sys.stdout)
+        writer.writerow([d[0] for d in cur.description])
+        batch = cur.fetchmany()
+        while batch:
+            writer.writerows(batch)
+            batch = cur.fetchmany()
+    else:
+        print(fmt_table(cur.fetchall(), null_display=NULL_DISPLAY))
+
+
+def cmd_baseline(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    params: List[Any] = []
+    where: List[str] = []
+
+    if args.center is not None:
+        # Bind center/span directly; the arithmetic is on literals, so the
+        # planner still turns this into an index range scan on bin_hz and the
+        # SQL text stays stable across invocations.
+        span_hz = int((args.span_khz or 100) * 1e3)
+        c_hz = to_hz(args.center)
+        where.append("bin_hz BETWEEN ?-? AND ?+?")
+        params.extend([c_hz, span_hz, c_hz, span_hz])
+    else:
+        lo_hz = to_hz(args.mhz_min) if args.mhz_min is not None else None
+        hi_hz = to_hz(args.mhz_max) if args.mhz_max is not None else None
+        clause, binds = between_clause("bin_hz", lo_hz, hi_hz)
+        if clause:
+            where.append(clause)
+            params.extend(binds)
+
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+
+    q = (
+        "SELECT bin_hz, "
+        "ROUND(ema_occ,3) AS occ, ROUND(ema_power_db,1) AS power_dB, last_seen_utc, total_obs, hits "
+        f"FROM baseline{where_sql} ORDER BY bin_hz LIMIT ?"
+    )
+    params.append(args.limit)
+    rows = query(con, q, params).fetchall()
+    print(fmt_table(rows))
+
+
+def cmd_top(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    rows = query(con, SQL_TOP, (args.limit,)).fetchall()
+    print(fmt_table(rows, null_display=NULL_DISPLAY))
+
+
+def cmd_summary(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    # One round-trip for all three counts instead of three separate queries.
+    sql_counts = (
+        "SELECT (SELECT COUNT(*) FROM scans), (SELECT COUNT(*) FROM detections), (SELECT COUNT(*) FROM baseline)"
+    )
+    sql_latest = (
+        "SELECT id, t_start_utc, t_end_utc, ROUND(f_start_hz/1e6,3), ROUND(f_stop_hz/1e6,3), fft, avg, samp_rate "
+        "FROM scans ORDER BY id DESC LIMIT 1"
+    )
+    sql_by_service = (
+        "SELECT COALESCE(NULLIF(service,''),'(unknown)') AS service, COUNT(*) AS count "
+        "FROM detections GROUP BY COALESCE(NULLIF(service,''),'(unknown)') "
+        "ORDER BY count DESC LIMIT 10"
+    )
+    # GROUP BY matches idx_det_snr_bucket so buckets come back pre-sorted.
+    sql_snr_hist = (
+        "SELECT CAST(snr_db/3 AS INT)*3 AS snr_dB_bucket, COUNT(*) AS count "
+        "FROM detections GROUP BY CAST(snr_db/3 AS INT) ORDER BY 1"
+    )
+
+    if getattr(args, "parallel", False):
+        # The aggregates are independent; with WAL, read-only connections can
+        # run them concurrently and overlap the big table scans.
+        from concurrent.futures import ThreadPoolExecutor
+
+        def run_one(sql: str):
+            c = open_db_ro(args.db)
+            try:
+                return query(c, sql).fetchall()
+            finally:
+                c.close()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            f_counts, f_latest, f_by_service, f_snr = [
+                pool.submit(run_one, s)
+                for s in (sql_counts, sql_latest, sql_by_service, sql_snr_hist)
+            ]
+            total_scans, total_det, total_bins = f_counts.result()[0]
+            latest_rows = f_latest.result()
+            latest = latest_rows[0] if latest_rows else None
+            by_service = f_by_service.result()
+            snr_hist = f_snr.result()
+    else:
+        total_scans, total_det, total_bins = query(con, sql_counts).fetchone()
+        latest = query(con, sql_latest).fetchone()
+        by_service = query(con, sql_by_service).fetchall()
+        snr_hist = query(con, sql_snr_hist).fetchall()
+
+    print("== Overview ==")
+    print(f"scans: {total_scans}  detections: {total_det}  baseline bins: {total_bins}")
+    if latest:
+        print(
+            f"latest scan id={latest[0]}  {latest[1]} → {latest[2]}  range={latest[3]}–{latest[4]} MHz  "
+            f"fft={latest[5]} avg={latest[6]} samp_rate={latest[7]} Hz"
+        )
+    print()
+    print("== Top services ==")
+    print(fmt_table(by_service, headers=["service", "count"]))
+
+    if snr_hist:
+        print()
+        print("== SNR histogram (3 dB buckets) ==")
+        print(fmt_table(snr_hist, headers=["snr_dB_bucket", "count"]))
+
+
+def cmd_export(con: sqlite3.Connection, args: argparse.Namespace) -> None:
+    # Reuse detection filters and dump to CSV file
+    ns = argparse.Namespace(
+        scan_id=args.scan_id,
+        all_scans=args.all_scans,
+        min_snr=args.min_snr,
+        service=args.service,
+        service_contains=args.service_contains,
+        region=args.region,
+        region_contains=args.region_contains,
+        since=args.since,
+        mhz_min=args.mhz_min,
+        mhz_max=args.mhz_max,
+        limit=args.limit,
+        csv=True,
+    )
+    with open(args.outfile, "w", newline="", encoding="utf-8") as f:
+        old = sys.stdout
+        sys.stdout = f
+        try:
+            cmd_detections(con, ns)
+        finally:
+            sys.stdout = old
+    print(f"wrote {args.outfile}")
+
+# ----------------------------
+# Main
+# ----------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Inspect an SDRWatch SQLite database")
+    p.add_argument("--db", default="sdrwatch.db", help="Path to sdrwatch.db")
+    p.add_argument("--explain", action="store_true", help="Print EXPLAIN QUERY PLAN for each query to stderr")
+
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    p_scans = sub.add_parser("scans", help="List scans")
+    p_scans.add_argument("--limit", type=int, default=10)
+    p_scans.set_defaults(func=cmd_scans)
+
+    p_det = sub.add_parser("detections", help="List detections (defaults to latest scan)")
+    p_det.add_argument("--scan-id", type=int)
+    p_det.add_argument("--all-scans", action="store_true", help="Do not restrict to latest scan")
+    p_det.add_argument("--min-snr", type=float)
+    p_det.add_argument("--service", type=str, help="Exact service name (uses index)")
+    p_det.add_argument("--service-contains", action="store_true", help="Treat --service as a substring (slow: full scan)")
+    p_det.add_argument("--region", type=str, help="Exact region name")
+    p_det.add_argument("--region-contains", action="store_true", help="Treat --region as a substring (slow: full scan)")
+    p_det.add_argument("--since", type=str, help="ISO-8601 lower bound, e.g., 2025-08-17T00:00:00Z")
+    p_det.add_argument("--mhz-min", type=float)
+    p_det.add_argument("--mhz-max", type=float)
+    p_det.add_argument("--limit", type=int, default=20)
+    p_det.add_argument("--csv", action="store_true", help="Output CSV to stdout")
+    p_det.set_defaults(func=cmd_detections)
+
+    p_base = sub.add_parser("baseline", help="Show baseline bins in a frequency window")
+    g = p_base.add_mutually_exclusive_group(required=False)
+    g.add_argument("--center", type=float, help="Center frequency in MHz")
+    p_base.add_argument("--span-khz", type=float, default=500.0, help="Half-span around center in kHz")
+    g.add_argument("--mhz-min", type=float, help="Lower bound in MHz")
+    p_base.add_argument("--mhz-max", type=float, help="Upper bound in MHz")
+    p_base.add_argument("--limit", type=int, default=200)
+    p_base.set_defaults(func=cmd_baseline)
+
+    p_top = sub.add_parser("top", help="Top detections by SNR")
+    p_top.add_argument("--limit", type=int, default=10)
+    p_top.set_defaults(func=cmd_top)
+
+    p_sum = sub.add_parser("summary", help="Database summary")
+    p_sum.add_argument("--parallel", action="store_true", help="Run the summary aggregates on parallel read-only connections")
+    p_sum.set_defaults(func=cmd_summary)
+
+    p_exp = sub.add_parser("export", help="Export detections to CSV (respects detection filters)")
+    p_exp.add_argument("--outfile", required=True)
+    p_exp.add_argument("--scan-id", type=int)
+    p_exp.add_argument("--all-scans", action="store_true")
+    p_exp.add_argument("--min-snr", type=float)
+    p_exp.add_argument("--service", type=str)
+    p_exp.add_argument("--service-contains", action="store_true")
+    p_exp.add_argument("--region", type=str)
+    p_exp.add_argument("--region-contains", action="store_true")
+    p_exp.add_argument("--since", type=str)
+    p_exp.add_argument("--mhz-min", type=float)
+    p_exp.add_argument("--mhz-max", type=float)
+    p_exp.add_argument("--limit", type=int, default=100000)
+    p_exp.set_defaults(func=cmd_export)
+
+    return p
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    global EXPLAIN
+    p = build_parser()
+    args = p.parse_args(argv)
+    EXPLAIN = args.explain
+    con = open_db(args.db)
+    try:
+        args.func(con, args)
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
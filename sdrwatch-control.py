@@ -22,10 +22,16 @@ completed scan.
 from __future__ import annotations
 
 import argparse
+import atexit
+import http.client
 import json
+import mmap
 import os
+import select
+from concurrent.futures import ThreadPoolExecutor
 import shlex
 import signal
+import socket
 import subprocess
 import sys
 import time
@@ -35,12 +41,26 @@ from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+# orjson is optional: C-implemented JSON, much faster for state snapshots,
+# journal appends and API responses. Stdlib json is the fallback.
+try:
+    import orjson  # type: ignore
+
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
 # ---------- Configuration ----------
 BASE_DIR = Path(os.environ.get("SDRWATCH_CONTROL_BASE", "/tmp/sdrwatch-control"))
 STATE_PATH = BASE_DIR / "state.json"
+JOURNAL_PATH = BASE_DIR / "state.log"
+SOCK_PATH = BASE_DIR / "control.sock"
 LOGS_DIR = BASE_DIR / "logs"
 LOCKS_DIR = BASE_DIR / "locks"
 
+# Rebuild the state.json snapshot after this many journal appends.
+JOURNAL_COMPACT_EVERY = 64
+
 # If your project locates scripts elsewhere, tweak these defaults:
 PYTHON_EXE = sys.executable or "python3"
 SDRWATCH_SCRIPT = Path(os.environ.get("SDRWATCH_SCRIPT", "sdrwatch.py"))
@@ -61,11 +81,22 @@ def now_ts() -> float:
     return time.time()
 
 
+def _json_dumps_bytes(obj: Any) -> bytes:
+    if HAVE_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if HAVE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def read_state() -> Dict[str, Any]:
     if STATE_PATH.exists():
         try:
-            with STATE_PATH.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            return _json_loads(STATE_PATH.read_bytes())
         except Exception:
             # Corrupted state; archive and start fresh
             bak = STATE_PATH.with_suffix(".corrupt.json")
@@ -78,10 +109,16 @@ def read_state() -> Dict[str, Any]:
 
 
 def write_state(state: Dict[str, Any]) -> None:
+    # Compact payload, one write() on a raw fd, then atomic rename. No fsync:
+    # the snapshot is regenerable from the journal after a crash.
     tmp = STATE_PATH.with_suffix(".tmp")
-    with tmp.open("w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, sort_keys=True)
-    tmp.replace(STATE_PATH)
+    buf = _json_dumps_bytes(state)
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+    os.replace(str(tmp), str(STATE_PATH))
 
 
 def pid_alive(pid: int) -> bool:
@@ -93,6 +130,22 @@ def pid_alive(pid: int) -> bool:
 
 
 # ---------- Device discovery ----------
+# Optional SDR bindings are imported once at startup; discovery paths branch
+# on the sentinels instead of re-running try/except import machinery on
+# every /devices hit.
+try:
+    import SoapySDR as _SOAPY  # type: ignore
+except Exception:
+    _SOAPY = None
+try:
+    from rtlsdr import RtlSdr as _RTLSDR  # type: ignore
+except Exception:
+    _RTLSDR = None
+
+_SOAPY_RTL_ARGS = dict(driver="rtlsdr")
+_SOAPY_HACKRF_ARGS = dict(driver="hackrf")
+
+
 @dataclass
 class Device:
     key: str                 # e.g., "rtl:0" or "hackrf:serial"
@@ -104,53 +157,71 @@ class Device:
 def discover_rtlsdr() -> List[Device]:
     devices: List[Device] = []
     # Try Soapy first for robust enumeration (if available)
-    try:
-        import SoapySDR  # type: ignore
-        devs = SoapySDR.Device.enumerate(dict(driver="rtlsdr"))
-        for i, d in enumerate(devs):
-            serial = d.get("serial", None)
-            label = d.get("label", f"RTL-SDR #{i}")
-            devices.append(Device(key=f"rtl:{i}", kind="rtlsdr", label=label + (f" (SN {serial})" if serial else ""), extra={"index": i, "serial": serial, "soapy_args": d}))
-        if devices:
-            return devices
-    except Exception:
-        pass
-    # Fallback: pyrtlsdr quick-probe by index
-    try:
-        from rtlsdr import RtlSdr  # type: ignore
-    except Exception:
+    if _SOAPY is not None:
+        try:
+            devs = _SOAPY.Device.enumerate(_SOAPY_RTL_ARGS)
+            for i, d in enumerate(devs):
+                serial = d.get("serial", None)
+                label = d.get("label", f"RTL-SDR #{i}")
+                devices.append(Device(key=f"rtl:{i}", kind="rtlsdr", label=label + (f" (SN {serial})" if serial else ""), extra={"index": i, "serial": serial, "soapy_args": d}))
+            if devices:
+                return devices
+        except Exception:
+            pass
+    # Fallback: pyrtlsdr quick-probe by index. Probes run in parallel: each
+    # failed open can burn ~200 ms in libusb timeouts, so serially checking
+    # 8 indices cost up to 1.6 s. This also fixes the old early `break`,
+    # which skipped index N+1 onward whenever index N was missing.
+    if _RTLSDR is None:
         return devices
 
-    for i in range(8):
+    def _probe_rtl(i: int) -> Optional[Device]:
         try:
-            sdr = RtlSdr(i)
-            serial = getattr(sdr, "serial_number", None)
-            devices.append(Device(key=f"rtl:{i}", kind="rtlsdr",
-                                  label=f"RTL-SDR #{i}" + (f" (SN {serial})" if serial else ""),
-                                  extra={"index": i, "serial": serial}))
-            sdr.close()
+            sdr = _RTLSDR(i)
         except Exception:
-            break
+            return None
+        try:
+            serial = getattr(sdr, "serial_number", None)
+            return Device(key=f"rtl:{i}", kind="rtlsdr",
+                          label=f"RTL-SDR #{i}" + (f" (SN {serial})" if serial else ""),
+                          extra={"index": i, "serial": serial})
+        finally:
+            try:
+                sdr.close()
+            except Exception:
+                pass
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(_probe_rtl, range(8)))
+    devices.extend(d for d in results if d is not None)
     return devices
 
 
+_HACKRF_INFO_CACHE: Tuple[float, List["Device"]] = (0.0, [])
+
+
 def discover_hackrf() -> List[Device]:
     devices: List[Device] = []
     # Try Soapy first
+    if _SOAPY is not None:
+        try:
+            devs = _SOAPY.Device.enumerate(_SOAPY_HACKRF_ARGS)
+            for i, d in enumerate(devs):
+                serial = d.get("serial", None)
+                label = d.get("label", f"HackRF One #{i}")
+                devices.append(Device(key=f"hackrf:{i}", kind="hackrf", label=label + (f" (SN {serial})" if serial else ""), extra={"index": i, "serial": serial, "soapy_args": d}))
+            if devices:
+                return devices
+        except Exception:
+            pass
+    # Fallback: hackrf_info parsing (cached — the subprocess costs 1-2 s of
+    # USB round trips and the answer rarely changes)
+    global _HACKRF_INFO_CACHE
+    ts, cached = _HACKRF_INFO_CACHE
+    if now_ts() - ts < 30.0:
+        return list(cached)
     try:
-        import SoapySDR  # type: ignore
-        devs = SoapySDR.Device.enumerate(dict(driver="hackrf"))
-        for i, d in enumerate(devs):
-            serial = d.get("serial", None)
-            label = d.get("label", f"HackRF One #{i}")
-            devices.append(Device(key=f"hackrf:{i}", kind="hackrf", label=label + (f" (SN {serial})" if serial else ""), extra={"index": i, "serial": serial, "soapy_args": d}))
-        if devices:
-            return devices
-    except Exception:
-        pass
-    # Fallback: hackrf_info parsing
-    try:
-        cp = subprocess.run(["hackrf_info"], capture_output=True, text=True, timeout=2)
+        cp = subprocess.run(["hackrf_info"], capture_output=True, text=True, timeout=0.5)
         out = cp.stdout
         blocks = out.split("Found HackRF")
         idx = 0
@@ -168,6 +239,7 @@ def discover_hackrf() -> List[Device]:
                 idx += 1
     except Exception:
         pass
+    _HACKRF_INFO_CACHE = (now_ts(), list(devices))
     return devices
 
 
@@ -181,6 +253,31 @@ def discover_devices() -> List[Device]:
     return list(uniq.values())
 
 
+# Probing hardware is expensive (Soapy enumeration, opening up to 8 RTL
+# indices, a hackrf_info subprocess), so discovery results are memoized with
+# a short TTL. Devices rarely appear/disappear between a UI click and the
+# job actually starting.
+_DISCOVER_CACHE: Tuple[float, List[Device]] = (0.0, [])
+_DISCOVER_LOCK = threading.Lock()
+
+
+def cached_discover(max_age: float = 5.0) -> List[Device]:
+    global _DISCOVER_CACHE
+    with _DISCOVER_LOCK:
+        ts, devs = _DISCOVER_CACHE
+        if now_ts() - ts < max_age:
+            return devs
+        devs = discover_devices()
+        _DISCOVER_CACHE = (now_ts(), devs)
+        return devs
+
+
+def invalidate_discover_cache() -> None:
+    global _DISCOVER_CACHE
+    with _DISCOVER_LOCK:
+        _DISCOVER_CACHE = (0.0, [])
+
+
 # ---------- Job model ----------
 @dataclass
 class Job:
@@ -195,12 +292,29 @@ class Job:
     params: Dict[str, Any]
     exit_code: Optional[int] = None
     finished_ts: Optional[float] = None
+    # Sanitized lock file path, computed once at creation so the acquire/
+    # release lifecycle doesn't redo the key munging per call. May be ""
+    # for jobs recorded before the field existed.
+    lock_path: str = ""
+
+
+def _freeze(v: Any) -> Any:
+    """Recursively convert dicts/lists into hashable tuples for cache keys."""
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(x) for x in v)
+    return v
+
+
+_CMD_CACHE: Dict[Any, Tuple[str, ...]] = {}
 
 
 class JobManager:
     def __init__(self) -> None:
         ensure_dirs()
         self.state = read_state()
+        self._replay_journal(self.state)
         self.jobs: Dict[str, Job] = {}
         for jid, j in self.state.get("jobs", {}).items():
             job = Job(**j)
@@ -209,59 +323,186 @@ class JobManager:
                 job.status = "finished"
                 job.finished_ts = now_ts()
                 job.exit_code = job.exit_code if job.exit_code is not None else -1
-                self._release_device(job.device_key)
+                self._release_device(job.device_key, job.lock_path)
             self.jobs[jid] = job
+        self._journal_lock = threading.Lock()
+        self._journal = JOURNAL_PATH.open("ab", buffering=0)
+        self._journal_writes = 0
+        atexit.register(self._compact)
+        # Snapshot rebuilds are debounced: mutations mark the state dirty and
+        # a writer thread flushes at most once per 100 ms window, so a burst
+        # of simultaneously-exiting jobs costs one write_state, not N.
+        self._dirty = threading.Event()
+        self._snapshot_lock = threading.Lock()
+        threading.Thread(target=self._snapshot_loop, name="state-writer", daemon=True).start()
+        threading.Thread(target=self._sweep_stale_locks, name="lock-sweeper", daemon=True).start()
+        # One reaper thread for all jobs: a pidfd becomes readable when its
+        # process exits, so a single epoll wait replaces one blocked
+        # proc.wait() thread per job. Falls back to per-job waiter threads
+        # on platforms without pidfd_open/epoll (non-Linux, kernel < 5.3).
+        self._pidfd_to_job: Dict[int, Tuple[str, str, subprocess.Popen]] = {}
+        # Separate per-job pidfds for liveness checks: a pidfd is readable
+        # iff the process has exited, so select() with a zero timeout
+        # replaces the os.kill(pid, 0) syscall-plus-exception probe.
+        self._pidfds: Dict[str, int] = {}
+        self._epoll: Optional["select.epoll"] = None
+        if hasattr(os, "pidfd_open") and hasattr(select, "epoll"):
+            try:
+                self._epoll = select.epoll()
+                threading.Thread(target=self._reap_loop, name="reaper", daemon=True).start()
+            except Exception:
+                self._epoll = None
         self._persist()
 
     # ---- persistence ----
-    def _persist(self) -> None:
-        data = {"jobs": {jid: asdict(j) for jid, j in self.jobs.items()}}
-        write_state(data)
+    @staticmethod
+    def _replay_journal(state: Dict[str, Any]) -> None:
+        """Apply journalled per-job deltas on top of the last snapshot."""
+        if not JOURNAL_PATH.exists():
+            return
+        try:
+            lines = JOURNAL_PATH.read_bytes().splitlines()
+        except Exception:
+            return
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                rec = _json_loads(line)
+            except Exception:
+                continue  # torn tail write; later records are replayed anyway
+            j = rec.get("job")
+            if j and j.get("id"):
+                state.setdefault("jobs", {})[j["id"]] = j
+
+    def _persist(self, job: Optional[Job] = None) -> None:
+        """Record a mutation.
+
+        Single-job changes append one compact JSON line to the journal —
+        O(1 job) instead of rewriting the whole state file per event. The
+        full snapshot is rebuilt every JOURNAL_COMPACT_EVERY appends, at
+        startup, and at interpreter exit.
+        """
+        if job is not None:
+            with self._journal_lock:
+                try:
+                    self._journal.write(_json_dumps_bytes({"job": asdict(job)}) + b"\n")
+                    self._journal_writes += 1
+                    if self._journal_writes < JOURNAL_COMPACT_EVERY:
+                        return
+                except Exception:
+                    pass
+        self._dirty.set()
+
+    def _snapshot_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            time.sleep(0.1)  # let a burst of mutations coalesce
+            self._dirty.clear()
+            try:
+                self._compact()
+            except Exception:
+                pass
+
+    def _compact(self) -> None:
+        """Write a consolidated snapshot and truncate the journal."""
+        with self._snapshot_lock:
+            data = {"jobs": {jid: asdict(j) for jid, j in self.jobs.items()}}
+            write_state(data)
+            try:
+                os.ftruncate(self._journal.fileno(), 0)
+            except Exception:
+                pass
+            self._journal_writes = 0
 
     # ---- device locking ----
     def _lock_path(self, device_key: str) -> Path:
         safe = device_key.replace(":", "_")
         return LOCKS_DIR / f"{safe}.lock"
 
+    def _job_alive(self, job: Job) -> bool:
+        fd = self._pidfds.get(job.id)
+        if fd is not None:
+            try:
+                r, _, _ = select.select([fd], [], [], 0)
+                return not r
+            except Exception:
+                pass
+        return bool(job.pid) and pid_alive(job.pid)
+
     def _is_job_running(self, job: Job) -> bool:
-        return bool(job.pid and pid_alive(job.pid) and job.status == "running")
+        return bool(job.pid and job.status == "running" and self._job_alive(job))
 
     def _acquire_device(self, device_key: str, owner: str) -> None:
+        """Atomically claim the device lock for `owner` (the job id).
+
+        O_CREAT|O_EXCL makes creation a single race-free syscall and the
+        owner is written up-front, replacing the old exists/unlink/open
+        dance (TOCTOU-prone, plus a second open to rewrite the owner).
+        On EEXIST the current holder is validated and a stale lock is
+        cleared before one retry.
+        """
         lp = self._lock_path(device_key)
-        if lp.exists():
+        for attempt in (0, 1):
             try:
-                existing_owner = lp.read_text(encoding="utf-8").strip()
-            except Exception:
-                existing_owner = ""
-            # If the lock is owned by a known job that isn't actually running, clear it.
-            if existing_owner and existing_owner in self.jobs:
-                job = self.jobs[existing_owner]
-                if not self._is_job_running(job):
-                    try:
-                        lp.unlink()
-                    except Exception:
-                        pass
-            # If still present and clearly stale (no job knows about it), clear
-            if lp.exists():
-                # Optional: if file is older than N minutes treat as stale
+                fd = os.open(str(lp), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
                 try:
-                    mtime = lp.stat().st_mtime
-                    if (now_ts() - mtime) > 3600:  # 1 hour
-                        lp.unlink()
+                    os.write(fd, owner.encode("utf-8"))
+                finally:
+                    os.close(fd)
+                return
+            except FileExistsError:
+                if attempt:
+                    break
+                try:
+                    existing_owner = lp.read_text(encoding="utf-8").strip()
+                except FileNotFoundError:
+                    continue  # raced with a release; retry the open
+                except Exception:
+                    existing_owner = ""
+                # Only a lock held by a known job that is no longer running
+                # is reclaimed inline; hour-old orphans are cleared by the
+                # background sweeper so the start fast path stays a single
+                # exclusive-create syscall.
+                if not (existing_owner in self.jobs
+                        and not self._is_job_running(self.jobs[existing_owner])):
+                    break
+                try:
+                    lp.unlink()
                 except Exception:
                     pass
-        if lp.exists():
-            raise RuntimeError(f"Device {device_key} is busy (lock present)")
-        with lp.open("w", encoding="utf-8") as f:
-            f.write(owner)
-
-    def _release_device(self, device_key: str) -> None:
-        lp = self._lock_path(device_key)
-        if lp.exists():
+        raise RuntimeError(f"Device {device_key} is busy (lock present)")
+
+    def _sweep_stale_locks(self, interval: float = 60.0) -> None:
+        """Periodically clear hour-old lock files not owned by a running job.
+
+        Moving the mtime check out of _acquire_device keeps the start path
+        to one exclusive-create syscall; orphans left by crashed daemons are
+        amortized into one directory scan a minute.
+        """
+        while True:
+            time.sleep(interval)
+            cutoff = now_ts() - 3600
             try:
-                lp.unlink()
+                entries = list(LOCKS_DIR.iterdir())
             except Exception:
-                pass
+                continue
+            for lp in entries:
+                try:
+                    if lp.stat().st_mtime > cutoff:
+                        continue
+                    owner = lp.read_text(encoding="utf-8").strip()
+                    if owner in self.jobs and self._is_job_running(self.jobs[owner]):
+                        continue
+                    lp.unlink()
+                except Exception:
+                    continue
+
+    def _release_device(self, device_key: str, lock_path: str = "") -> None:
+        try:
+            os.unlink(lock_path or str(self._lock_path(device_key)))
+        except Exception:
+            pass
 
     # ---- job lifecycle ----
     def list_jobs(self) -> List[Job]:
@@ -272,51 +513,111 @@ class JobManager:
             raise KeyError(f"Job {job_id} not found")
         # update liveness lazily
         job = self.jobs[job_id]
-        if job.pid and job.status == "running" and not pid_alive(job.pid):
+        if job.pid and job.status == "running" and not self._job_alive(job):
             job.status = "finished"
             job.finished_ts = now_ts()
-            self._release_device(job.device_key)
-            self._persist()
+            self._release_device(job.device_key, job.lock_path)
+            self._persist(job)
         return job
 
+    def _finish_job(self, job_id: str, device_key: str, rc: int) -> None:
+        """Record a child exit: update job status, free the device, persist."""
+        fd = self._pidfds.pop(job_id, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except Exception:
+                pass
+        job = self.jobs.get(job_id)
+        if job:
+            job.exit_code = rc
+            job.pid = None
+            job.finished_ts = now_ts()
+            job.status = "finished" if rc == 0 else "error"
+        self._release_device(device_key, job.lock_path if job else "")
+        self._persist(job)
+
+    def _reap_loop(self) -> None:
+        while True:
+            try:
+                events = self._epoll.poll(1.0)
+            except Exception:
+                time.sleep(1.0)
+                continue
+            for fd, _mask in events:
+                try:
+                    self._epoll.unregister(fd)
+                except Exception:
+                    pass
+                info = self._pidfd_to_job.pop(fd, None)
+                try:
+                    os.close(fd)
+                except Exception:
+                    pass
+                if info is None:
+                    continue
+                job_id, device_key, proc = info
+                try:
+                    rc = proc.wait()  # child already exited; returns immediately
+                except Exception:
+                    rc = -1
+                self._finish_job(job_id, device_key, rc)
+
     def _spawn_reaper(self, job_id: str, proc: subprocess.Popen, device_key: str) -> None:
+        if self._epoll is not None:
+            try:
+                fd = os.pidfd_open(proc.pid)
+                self._pidfd_to_job[fd] = (job_id, device_key, proc)
+                self._epoll.register(fd, select.EPOLLIN)
+                return
+            except Exception:
+                pass
+        # Fallback: dedicated waiter thread per job
         def _watch():
             try:
                 rc = proc.wait()
             except Exception:
                 rc = -1
-            # Update job status and free device
-            job = self.jobs.get(job_id)
-            if job:
-                job.exit_code = rc
-                job.pid = None
-                job.finished_ts = now_ts()
-                job.status = "finished" if rc == 0 else "error"
-            self._release_device(device_key)
-            self._persist()
+            self._finish_job(job_id, device_key, rc)
         t = threading.Thread(target=_watch, name=f"reaper-{job_id}", daemon=True)
         t.start()
 
     def start_job(self, *, device_key: str, label: str, sdrwatch_args: Dict[str, Any]) -> Job:
-        # Refuse to start if the device is already locked (but clear stale locks first)
-        self._acquire_device(device_key, owner="pending")
+        # The job id is generated first so the lock can carry its real owner
+        # from the moment it exists — no "pending" placeholder to rewrite.
+        jid = short_uuid()
+        self._acquire_device(device_key, owner=jid)
         try:
-            # If we have discovery metadata for this device, attach it for downstream
-            discover_map = {d.key: d for d in discover_devices()}
-            if device_key in discover_map:
-                meta = discover_map[device_key].extra
+            # Attach discovery metadata for downstream without paying for a
+            # hardware probe when we can avoid it: use whatever the cache
+            # already holds, synthesize the index for rtl:<N> keys, and only
+            # enumerate for real when the key format is unrecognized.
+            meta: Optional[Dict[str, Any]] = None
+            for d in _DISCOVER_CACHE[1]:  # peek; never triggers a probe
+                if d.key == device_key:
+                    meta = d.extra
+                    break
+            if meta is None and device_key.startswith("rtl:"):
+                idx = device_key.split(":", 1)[-1]
+                if idx.isdigit():
+                    meta = {"index": idx}
+            if meta is None:
+                discover_map = {d.key: d for d in cached_discover()}
+                if device_key in discover_map:
+                    meta = discover_map[device_key].extra
+            if meta is not None:
                 sdrwatch_args = dict(sdrwatch_args)  # copy
                 sdrwatch_args["__discover_meta"] = meta
 
-            jid = short_uuid()
             log_path = str(LOGS_DIR / f"{jid}.log")
             cmd = self._build_cmd(device_key=device_key, args=sdrwatch_args)
-            # Update lock with owner id
-            with self._lock_path(device_key).open("w", encoding="utf-8") as f:
-                f.write(jid)
 
-            with open(log_path, "w", encoding="utf-8") as logf:
-                proc = subprocess.Popen(cmd, stdout=logf, stderr=subprocess.STDOUT, text=True)
+            # Binary redirection: stdout goes straight to the log fd, so the
+            # TextIOWrapper that text=True would set up is never used anyway.
+            # This also means no pump thread and no per-line Python reads —
+            # the kernel moves scanner output to disk without us in the loop.
+            with open(log_path, "wb") as logf:
+                proc = subprocess.Popen(cmd, stdout=logf, stderr=subprocess.STDOUT)
 
             job = Job(
                 id=jid,
@@ -328,9 +629,15 @@ class JobManager:
                 cmd=cmd,
                 log_path=log_path,
                 params={k: v for k, v in sdrwatch_args.items() if k != "__discover_meta"},
+                lock_path=str(self._lock_path(device_key)),
             )
             self.jobs[jid] = job
-            self._persist()
+            if hasattr(os, "pidfd_open"):
+                try:
+                    self._pidfds[jid] = os.pidfd_open(proc.pid)
+                except Exception:
+                    pass
+            self._persist(job)
             # Launch reaper to free the device when the process exits
             self._spawn_reaper(jid, proc, device_key)
             return job
@@ -348,19 +655,34 @@ class JobManager:
         except ProcessLookupError:
             job.status = "finished"
             job.finished_ts = now_ts()
-            self._release_device(job.device_key)
-            self._persist()
+            self._release_device(job.device_key, job.lock_path)
+            self._persist(job)
             return job
 
-        t0 = time.time()
-        while time.time() - t0 < wait:
-            if not pid_alive(job.pid):
-                job.status = "finished"
-                job.finished_ts = now_ts()
-                self._release_device(job.device_key)
-                self._persist()
-                return job
-            time.sleep(0.2)
+        # Block on the pidfd becoming readable (= child exited) rather than
+        # polling os.kill every 200 ms; poll-loop fallback when no pidfd.
+        fd = self._pidfds.get(job_id)
+        exited = False
+        if fd is not None:
+            try:
+                p = select.poll()
+                p.register(fd, select.POLLIN)
+                exited = bool(p.poll(int(wait * 1000)))
+            except Exception:
+                exited = not pid_alive(job.pid)
+        else:
+            t0 = time.time()
+            while time.time() - t0 < wait:
+                if not pid_alive(job.pid):
+                    exited = True
+                    break
+                time.sleep(0.2)
+        if exited:
+            job.status = "finished"
+            job.finished_ts = now_ts()
+            self._release_device(job.device_key, job.lock_path)
+            self._persist(job)
+            return job
         # force kill
         try:
             os.kill(job.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
@@ -368,11 +690,30 @@ class JobManager:
             pass
         job.status = "finished"
         job.finished_ts = now_ts()
-        self._release_device(job.device_key)
-        self._persist()
+        self._release_device(job.device_key, job.lock_path)
+        self._persist(job)
         return job
 
     def _build_cmd(self, *, device_key: str, args: Dict[str, Any]) -> List[str]:
+        """Translate a stable API dict into the concrete sdrwatch.py CLI.
+
+        Scheduled/periodic jobs restart with identical parameters, so the
+        translated argv is memoized on a frozen (device_key, args) key;
+        unhashable arg values just skip the cache.
+        """
+        try:
+            key = (device_key, _freeze(args))
+        except TypeError:
+            return self._build_cmd_uncached(device_key=device_key, args=args)
+        cmd = _CMD_CACHE.get(key)
+        if cmd is None:
+            cmd = tuple(self._build_cmd_uncached(device_key=device_key, args=args))
+            if len(_CMD_CACHE) >= 128:
+                _CMD_CACHE.clear()
+            _CMD_CACHE[key] = cmd
+        return list(cmd)
+
+    def _build_cmd_uncached(self, *, device_key: str, args: Dict[str, Any]) -> List[str]:
         """Translate a stable API dict into the concrete sdrwatch.py CLI."""
         cmd = [PYTHON_EXE, str(SDRWATCH_SCRIPT)]
         soapy_args_kv: Dict[str, Any] = {}
@@ -440,27 +781,84 @@ class JobManager:
     # ---- logs ----
     def read_logs(self, job_id: str, tail: Optional[int] = None) -> str:
         job = self.get_job(job_id)
+        # mmap the log and, for tail requests, walk backwards counting
+        # newlines so a poll touches only the last N lines instead of
+        # reading/splitting the whole (potentially multi-MB) file.
         try:
-            with open(job.log_path, "r", encoding="utf-8", errors="replace") as f:
-                data = f.read()
+            fd = os.open(job.log_path, os.O_RDONLY)
         except FileNotFoundError:
             return "<no logs yet>"
-        if tail is not None and tail > 0:
-            lines = data.splitlines()
-            return "\n".join(lines[-tail:])
-        return data
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                return ""
+            mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+            try:
+                if tail is None or tail <= 0:
+                    return mm[:].decode("utf-8", "replace")
+                # Skip a trailing newline so it doesn't count as a line
+                end = size
+                if mm[end - 1 : end] == b"\n":
+                    end -= 1
+                pos = end
+                for _ in range(tail):
+                    pos = mm.rfind(b"\n", 0, pos)
+                    if pos < 0:
+                        return mm[:end].decode("utf-8", "replace")
+                return mm[pos + 1 : end].decode("utf-8", "replace")
+            finally:
+                mm.close()
+        finally:
+            os.close(fd)
+
+    def read_logs_from(self, job_id: str, offset: int) -> Tuple[str, int, bool]:
+        """Bytes appended since ``offset`` plus the new cursor.
+
+        Returns (text, new_offset, reset); ``reset`` is True when the file
+        is shorter than the cursor (new job, rotated log), telling the
+        caller to start over rather than splice stale output.
+        """
+        job = self.get_job(job_id)
+        try:
+            fd = os.open(job.log_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return "", 0, offset > 0
+        try:
+            size = os.fstat(fd).st_size
+            reset = offset > size or offset < 0
+            start = 0 if reset else offset
+            if start >= size:
+                return "", size, reset
+            os.lseek(fd, start, os.SEEK_SET)
+            data = os.read(fd, size - start)
+            return data.decode("utf-8", "replace"), size, reset
+        finally:
+            os.close(fd)
 
 
 # ---------- HTTP server (optional) ----------
 
 def make_app(manager: JobManager, token: Optional[str] = None):
     try:
-        from flask import Flask, request, jsonify # type: ignore
+        from flask import Flask, request, jsonify, send_file # type: ignore
     except Exception as e:
         raise SystemExit("Flask is required for --serve mode. pip install flask")
 
     app = Flask(__name__)
 
+    if HAVE_ORJSON:
+        # Route jsonify/request.get_json through orjson
+        from flask.json.provider import JSONProvider  # type: ignore
+
+        class _OrjsonProvider(JSONProvider):
+            def dumps(self, obj: Any, **kwargs: Any) -> str:
+                return orjson.dumps(obj).decode("utf-8")
+
+            def loads(self, s: Any, **kwargs: Any) -> Any:
+                return orjson.loads(s)
+
+        app.json = _OrjsonProvider(app)
+
     def _auth_ok() -> bool:
         if not token:
             return True
@@ -475,7 +873,7 @@ def make_app(manager: JobManager, token: Optional[str] = None):
 
     @app.get("/devices")
     def devices():
-        devs = [asdict(d) for d in discover_devices()]
+        devs = [asdict(d) for d in cached_discover(1.0)]
         return jsonify(devs)
 
     @app.get("/jobs")
@@ -515,7 +913,29 @@ def make_app(manager: JobManager, token: Optional[str] = None):
     @app.get("/jobs/<job_id>/logs")
     def job_logs(job_id: str):
         tail = request.args.get("tail", type=int)
+        offset = request.args.get("offset", type=int)
         try:
+            if offset is not None:
+                # Cursor poll: only the bytes appended since the client's
+                # last read, with the new cursor in a header. A quiet log
+                # costs an empty 200 instead of re-sending the whole tail.
+                data, new_offset, reset = manager.read_logs_from(job_id, offset)
+                resp = app.response_class(data, mimetype="text/plain")
+                resp.headers["X-Log-Offset"] = str(new_offset)
+                resp.headers["X-Log-Reset"] = "1" if reset else "0"
+                return resp
+            if tail is None:
+                # Full-file requests stream straight from the file: werkzeug
+                # can hand the fd to the WSGI server's sendfile path instead
+                # of materializing the log as a Python string, and
+                # conditional=True gives pollers ETag/If-Modified-Since and
+                # Range support so unchanged logs cost a 304.
+                job = manager.get_job(job_id)
+                try:
+                    return send_file(job.log_path, mimetype="text/plain",
+                                     conditional=True)
+                except FileNotFoundError:
+                    return app.response_class("<no logs yet>", mimetype="text/plain")
             data = manager.read_logs(job_id, tail=tail)
             return app.response_class(data, mimetype="text/plain")
         except KeyError as e:
@@ -526,8 +946,65 @@ def make_app(manager: JobManager, token: Optional[str] = None):
 
 # ---------- CLI ----------
 
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over an AF_UNIX socket."""
+
+    def __init__(self, sock_path: str):
+        super().__init__("localhost")
+        self._sock_path = sock_path
+
+    def connect(self) -> None:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(10.0)
+        s.connect(self._sock_path)
+        self.sock = s
+
+
+def _daemon_request(method: str, path: str,
+                    body: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, bytes]]:
+    """Route a CLI call to a running serve daemon over its Unix socket.
+
+    Constructing a fresh JobManager per subcommand re-reads and rewrites the
+    state file; when the daemon is up it already holds the authoritative job
+    table, so asking it is both cheaper and avoids split-brain state edits.
+    Returns None when no daemon is listening, and the caller falls back to
+    an in-process JobManager.
+    """
+    if not SOCK_PATH.exists():
+        return None
+    try:
+        conn = _UnixHTTPConnection(str(SOCK_PATH))
+        headers: Dict[str, str] = {}
+        tok = os.environ.get("SDRWATCH_CONTROL_TOKEN")
+        if tok:
+            headers["Authorization"] = f"Bearer {tok}"
+        payload = None
+        if body is not None:
+            payload = _json_dumps_bytes(body)
+            headers["Content-Type"] = "application/json"
+        conn.request(method, path, body=payload, headers=headers)
+        resp = conn.getresponse()
+        data = resp.read()
+        status = resp.status
+        conn.close()
+        return status, data
+    except Exception:
+        return None  # stale socket or daemon gone
+
+
+def _print_job_json(status: int, data: bytes) -> int:
+    obj = _json_loads(data)
+    if status >= 400:
+        print(obj.get("error", data.decode("utf-8", "replace")), file=sys.stderr)
+        return 1
+    print(json.dumps(obj, indent=2))
+    return 0
+
+
 def cmd_discover(_args: argparse.Namespace) -> int:
-    devs = discover_devices()
+    # Explicit discovery always re-probes the hardware
+    invalidate_discover_cache()
+    devs = cached_discover()
     if not devs:
         print("No devices found.")
         return 1
@@ -581,14 +1058,30 @@ def cmd_start(args: argparse.Namespace) -> int:
     if args.extra:
         params["extra_args"] = args.extra
 
-    job = jm.start_job(device_key=args.device, label=args.label or f"job-{short_uuid()}", sdrwatch_args=params)
+    label = args.label or f"job-{short_uuid()}"
+    r = _daemon_request("POST", "/jobs",
+                        body={"device_key": args.device, "label": label, "params": params})
+    if r is not None:
+        status, data = r
+        obj = _json_loads(data)
+        if status >= 400:
+            print(obj.get("error", "start failed"), file=sys.stderr)
+            return 1
+        print(obj["id"])
+        return 0
+
+    jm = JobManager()
+    job = jm.start_job(device_key=args.device, label=label, sdrwatch_args=params)
     print(job.id)
     return 0
 
 
 def cmd_list(_args: argparse.Namespace) -> int:
-    jm = JobManager()
-    rows = jm.list_jobs()
+    r = _daemon_request("GET", "/jobs")
+    if r is not None and r[0] == 200:
+        rows = [Job(**j) for j in _json_loads(r[1])]
+    else:
+        rows = JobManager().list_jobs()
     if not rows:
         print("No jobs.")
         return 0
@@ -599,6 +1092,9 @@ def cmd_list(_args: argparse.Namespace) -> int:
 
 
 def cmd_status(args: argparse.Namespace) -> int:
+    r = _daemon_request("GET", f"/jobs/{args.job_id}")
+    if r is not None:
+        return _print_job_json(*r)
     jm = JobManager()
     try:
         j = jm.get_job(args.job_id)
@@ -610,12 +1106,19 @@ def cmd_status(args: argparse.Namespace) -> int:
 
 
 def cmd_logs(args: argparse.Namespace) -> int:
-    jm = JobManager()
-    try:
-        data = jm.read_logs(args.job_id, tail=args.tail)
-    except KeyError as e:
-        print(str(e), file=sys.stderr)
-        return 1
+    path = f"/jobs/{args.job_id}/logs"
+    if args.tail is not None:
+        path += f"?tail={args.tail}"
+    r = _daemon_request("GET", path)
+    if r is not None and r[0] == 200:
+        data = r[1].decode("utf-8", "replace")
+    else:
+        jm = JobManager()
+        try:
+            data = jm.read_logs(args.job_id, tail=args.tail)
+        except KeyError as e:
+            print(str(e), file=sys.stderr)
+            return 1
     sys.stdout.write(data)
     if not data.endswith("\n"):
         sys.stdout.write("\n")
@@ -623,6 +1126,9 @@ def cmd_logs(args: argparse.Namespace) -> int:
 
 
 def cmd_stop(args: argparse.Namespace) -> int:
+    r = _daemon_request("DELETE", f"/jobs/{args.job_id}")
+    if r is not None:
+        return _print_job_json(*r)
     jm = JobManager()
     try:
         j = jm.stop_job(args.job_id)
@@ -637,7 +1143,26 @@ def cmd_serve(args: argparse.Namespace) -> int:
     token = args.token or os.environ.get("SDRWATCH_CONTROL_TOKEN")
     jm = JobManager()
     app = make_app(jm, token=token)
-    app.run(host=args.host, port=args.port, debug=False)
+    # Prefer waitress: Werkzeug's dev server handles one request at a time,
+    # so a slow /logs poll blocks discovery and job starts. A small thread
+    # pool keeps the API responsive under concurrent UI polling.
+    try:
+        from waitress import serve  # type: ignore
+    except Exception:
+        app.run(host=args.host, port=args.port, debug=False)
+    else:
+        # Also listen on a Unix socket so CLI subcommands on this host can
+        # reuse the daemon's in-memory job table instead of re-reading
+        # state from disk (and racing its writes).
+        try:
+            SOCK_PATH.unlink()
+        except Exception:
+            pass
+        threading.Thread(target=serve, args=(app,),
+                         kwargs=dict(unix_socket=str(SOCK_PATH), threads=2),
+                         name="unix-api", daemon=True).start()
+        atexit.register(lambda: SOCK_PATH.unlink(missing_ok=True))
+        serve(app, host=args.host, port=args.port, threads=8)
     return 0
 
 
@@ -20,9 +20,20 @@ Auth notes:
   If not set, we fall back to SDRWATCH_TOKEN as a convenience.
 """
 from __future__ import annotations
-import argparse, os, io, sqlite3, math, json
+import argparse, atexit, csv, os, io, sqlite3, math, json, tempfile, threading, time
+from datetime import datetime as _dt, timedelta as _td
 from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
 from flask import Flask, request, Response, render_template, render_template_string, jsonify, abort  # type: ignore
+from jinja2 import FileSystemBytecodeCache  # type: ignore
+
+# flask-compress is optional: rendered dashboards are 40-100 KB of highly
+# repetitive markup that compresses 5-10x at negligible CPU cost.
+try:
+    from flask_compress import Compress  # type: ignore
+    HAVE_COMPRESS = True
+except Exception:
+    HAVE_COMPRESS = False
 from urllib import request as urlreq, parse as urlparse, error as urlerr
 
 # ================================
@@ -39,9 +50,25 @@ CONTROL_TOKEN = os.getenv("SDRWATCH_CONTROL_TOKEN", "") or os.getenv("SDRWATCH_T
 
 def open_db_ro(path: str) -> sqlite3.Connection:
     abspath = os.path.abspath(path)
-    con = sqlite3.connect(f"file:{abspath}?mode=ro", uri=True, check_same_thread=False)
+    # cached_statements: the listing/export SQL is assembled from filters
+    # appended in one canonical order, so only a few dozen distinct strings
+    # ever exist and each prepares once per connection instead of being
+    # re-parsed and re-planned on every request.
+    con = sqlite3.connect(f"file:{abspath}?mode=ro", uri=True,
+                          check_same_thread=False, cached_statements=128)
     con.execute("PRAGMA busy_timeout=2000;")
-    con.row_factory = lambda cur, row: {d[0]: row[i] for i, d in enumerate(cur.description)}
+    # Read-side tuning: mmap the file so repeat reads hit page cache instead
+    # of pread syscalls, give SQLite a 64 MB page cache, and keep sort/temp
+    # b-trees in memory. query_only is redundant with mode=ro but makes the
+    # intent explicit if the URI ever changes.
+    con.execute("PRAGMA mmap_size=268435456;")
+    con.execute("PRAGMA cache_size=-65536;")
+    con.execute("PRAGMA temp_store=MEMORY;")
+    con.execute("PRAGMA query_only=1;")
+    # C-implemented mapping rows: the old dict-building lambda did one dict
+    # plus N hash inserts per row in Python. sqlite3.Row keeps r['name']
+    # access (and Jinja's r.name falls back to __getitem__).
+    con.row_factory = sqlite3.Row
     return con
 
 def q1(con: sqlite3.Connection, sql: str, params: Tuple[Any, ...] = ()):  # one row
@@ -52,47 +79,103 @@ def qa(con: sqlite3.Connection, sql: str, params: Tuple[Any, ...] = ()):  # all
     cur = con.execute(sql, params)
     return cur.fetchall()
 
+def qt(con: sqlite3.Connection, sql: str, params: Tuple[Any, ...] = ()):
+    # All rows as plain tuples. The dict row factory allocates a dict and
+    # re-hashes the column names for every row; on bulk single-column
+    # fetches that dominates, so hot paths index by position instead.
+    cur = con.cursor()
+    cur.row_factory = None  # type: ignore[assignment]
+    return cur.execute(sql, params).fetchall()
+
 # ================================
 # Graph helpers
 # ================================
 
-def _percentile(xs: List[float], p: float) -> Optional[float]:
-    if not xs: return None
-    xs = sorted(xs); k = (len(xs) - 1) * p; f = int(math.floor(k)); c = int(math.ceil(k))
-    if f == c: return float(xs[f])
-    return float(xs[f] + (xs[c] - xs[f]) * (k - f))
+def _percentiles(xs, ps: List[float]) -> List[float]:
+    # Linear-interpolated percentiles in one pass: np.partition is O(N)
+    # introselect, versus the O(N log N) full sort this used to do once
+    # per requested quantile.
+    a = np.asarray(xs, dtype=np.float64)
+    ks = (a.size - 1) * np.asarray(ps, dtype=np.float64)
+    lo = np.floor(ks).astype(np.int64)
+    hi = np.ceil(ks).astype(np.int64)
+    part = np.partition(a, np.unique(np.concatenate([lo, hi])))
+    return (part[lo] + (part[hi] - part[lo]) * (ks - lo)).tolist()
 
 def _scale_counts_to_px(series: List[Dict[str, Any]], count_key: str = "count") -> float:
-    values: List[float] = []
-    for x in series:
-        try: v = float(x.get(count_key, 0) or 0)
-        except Exception: v = 0.0
-        values.append(v)
-    maxc = max(values) if values else 0.0
-    for i, x in enumerate(series):
-        c = values[i]
-        if maxc <= 0 or c <= 0: x["height_px"] = 0
-        else:
-            h = int(round((c / maxc) * CHART_HEIGHT_PX))
-            x["height_px"] = max(2, h)
+    if not series:
+        return 0.0
+    vals = np.asarray([x.get(count_key, 0) or 0 for x in series], dtype=np.float64)
+    maxc = float(vals.max())
+    if maxc <= 0:
+        heights = np.zeros(vals.size, dtype=np.int64)
+    else:
+        heights = np.maximum(2, np.rint(vals / maxc * CHART_HEIGHT_PX).astype(np.int64))
+        heights[vals <= 0] = 0
+    for x, h in zip(series, heights.tolist()):
+        x["height_px"] = h
     return maxc
 
+_SQLITE_HAS_FLOOR: Optional[bool] = None
+
+def _sqlite_has_floor(con: sqlite3.Connection) -> bool:
+    # Math functions are a compile-time SQLite option (3.35+); probe once.
+    global _SQLITE_HAS_FLOOR
+    if _SQLITE_HAS_FLOOR is None:
+        try:
+            con.execute("SELECT floor(1.5)").fetchone()
+            _SQLITE_HAS_FLOOR = True
+        except sqlite3.OperationalError:
+            _SQLITE_HAS_FLOOR = False
+    return _SQLITE_HAS_FLOOR
+
+def _snr_percentile_sql(con: sqlite3.Connection, count: int, p: float) -> float:
+    # Linear-interpolated percentile fetched as two ordered rows; the sort
+    # happens in SQLite's C code instead of marshaling N rows into Python.
+    k = (count - 1) * p
+    f = int(math.floor(k))
+    pair = qt(con, "SELECT snr_db FROM detections WHERE snr_db IS NOT NULL ORDER BY snr_db LIMIT 2 OFFSET ?", (f,))
+    v0 = float(pair[0][0]); v1 = float(pair[-1][0])
+    return v0 + (v1 - v0) * (k - f)
+
 def snr_histogram(con: sqlite3.Connection, bucket_db: int = 3):
-    rows = qa(con, "SELECT snr_db FROM detections WHERE snr_db IS NOT NULL")
-    vals: List[float] = []
-    for r in rows:
-        try: vals.append(float(r['snr_db']))
-        except Exception: pass
-    buckets: Dict[int, int] = {}
-    for s in vals:
-        b = int(math.floor(s / bucket_db)) * bucket_db
-        buckets[b] = buckets.get(b, 0) + 1
-    labels_sorted = sorted(buckets.keys())
-    hist = [{"label": f"{b}–{b+bucket_db}", "count": buckets[b]} for b in labels_sorted]
+    if _sqlite_has_floor(con):
+        # Bucket counts entirely inside SQLite: one scan, no per-row Python.
+        rows = qt(con, """
+            SELECT CAST(floor(snr_db / ?) AS INTEGER) * ? AS b, COUNT(*) AS c
+            FROM detections WHERE snr_db IS NOT NULL
+            GROUP BY b ORDER BY b
+        """, (bucket_db, bucket_db))
+        if not rows:
+            return [], None
+        hist = [{"label": f"{int(b)}–{int(b) + bucket_db}", "count": int(c)} for b, c in rows]
+        _scale_counts_to_px(hist, "count")
+        agg = q1(con, "SELECT COUNT(*) AS c, MAX(snr_db) AS mx FROM detections WHERE snr_db IS NOT NULL")
+        count = int(agg['c'])
+        stats = {"count": count,
+                 "p50": _snr_percentile_sql(con, count, 0.50),
+                 "p90": _snr_percentile_sql(con, count, 0.90),
+                 "p100": float(agg['mx'])}
+        return hist, stats
+    # SQLite built without math functions: NumPy path over the raw column
+    rows = qt(con, "SELECT snr_db FROM detections WHERE snr_db IS NOT NULL")
+    try:
+        vals = np.fromiter((r[0] for r in rows), dtype=np.float64, count=len(rows))
+    except (TypeError, ValueError):  # stray non-numeric values
+        vals = np.asarray([float(r[0]) for r in rows
+                           if isinstance(r[0], (int, float))], dtype=np.float64)
+    vals = vals[np.isfinite(vals)]
+    if vals.size == 0:
+        return [], None
+    lo = math.floor(vals.min() / bucket_db) * bucket_db
+    hi = math.floor(vals.max() / bucket_db) * bucket_db + bucket_db
+    edges = np.arange(lo, hi + bucket_db, bucket_db, dtype=np.float64)
+    counts, _ = np.histogram(vals, bins=edges)
+    hist = [{"label": f"{int(b)}–{int(b) + bucket_db}", "count": int(c)}
+            for b, c in zip(edges[:-1].tolist(), counts.tolist()) if c > 0]
     _scale_counts_to_px(hist, "count")
-    stats = None
-    if vals:
-        stats = {"count": len(vals), "p50": _percentile(vals, 0.50) or 0.0, "p90": _percentile(vals, 0.90) or 0.0, "p100": max(vals)}
+    p50, p90, p100 = _percentiles(vals, [0.5, 0.9, 1.0])
+    stats = {"count": int(vals.size), "p50": p50, "p90": p90, "p100": p100}
     return hist, stats
 
 def detections_by_hour(con: sqlite3.Connection, hours: int = 24):
@@ -103,9 +186,8 @@ def detections_by_hour(con: sqlite3.Connection, hours: int = 24):
         GROUP BY hour
         ORDER BY hour
     """, (f"-{hours-1} hours",))
-    from datetime import datetime, timedelta
-    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-    timeline = [(now - timedelta(hours=i)).strftime("%Y-%m-%d %H:00:00") for i in reversed(range(hours))]
+    now = _dt.utcnow().replace(minute=0, second=0, microsecond=0)
+    timeline = [(now - _td(hours=i)).strftime("%Y-%m-%d %H:00:00") for i in reversed(range(hours))]
     lookup = {r['hour']: int(r['c']) for r in rows if r['hour'] is not None}
     out = [{"hour": h, "count": lookup.get(h, 0)} for h in timeline]
     _scale_counts_to_px(out, "count")
@@ -118,16 +200,21 @@ def frequency_bins_latest_scan(con: sqlite3.Connection, num_bins: int = 40):
     f0 = float(latest['f_start_hz']); f1 = float(latest['f_stop_hz'])
     if not (f1 > f0):
         return [], latest, 0
-    dets = qa(con, "SELECT f_center_hz FROM detections WHERE scan_id = ?", (latest['id'],))
-    if not dets:
-        return [], latest, 0
     width = (f1 - f0) / max(1, num_bins)
+    # Bin assignment pushed into SQLite: CAST truncation equals floor here
+    # because the WHERE clause keeps f_center_hz >= f0, and scalar MIN
+    # clamps the last edge like the old Python loop did.
+    counts = qt(con, """
+        SELECT MIN(CAST((f_center_hz - ?) / ? AS INTEGER), ?) AS b, COUNT(*) AS c
+        FROM detections
+        WHERE scan_id = ? AND f_center_hz >= ? AND f_center_hz < ?
+        GROUP BY b
+    """, (f0, width, num_bins - 1, latest['id'], f0, f1))
+    if not counts:
+        return [], latest, 0
     bins = [{"count":0, "mhz_start": (f0 + i*width)/1e6, "mhz_end": (f0 + (i+1)*width)/1e6} for i in range(num_bins)]
-    for r in dets:
-        try: fc = float(r['f_center_hz'])
-        except Exception: continue
-        if fc < f0 or fc >= f1: continue
-        idx = int((fc - f0) // width); idx = max(0, min(num_bins-1, idx)); bins[idx]["count"] += 1
+    for b, c in counts:
+        bins[int(b)]["count"] = int(c)
     maxc = _scale_counts_to_px(bins, "count")
     return bins, latest, int(maxc)
 
@@ -138,23 +225,31 @@ def frequency_bins_all_scans_avg(con: sqlite3.Connection, num_bins: int = 40):
     f0 = float(bounds['fmin']); f1 = float(bounds['fmax'])
     if not (f1 > f0):
         return [], 0.0, 0.0, 0.0
-    dets = qa(con, "SELECT f_center_hz FROM detections WHERE f_center_hz BETWEEN ? AND ?", (int(f0), int(f1)))
-    scans = qa(con, "SELECT f_start_hz, f_stop_hz FROM scans WHERE f_stop_hz > f_start_hz")
+    dets = qt(con, "SELECT f_center_hz FROM detections WHERE f_center_hz BETWEEN ? AND ?", (int(f0), int(f1)))
+    scans = qt(con, "SELECT f_start_hz, f_stop_hz FROM scans WHERE f_stop_hz > f_start_hz")
     width = (f1 - f0) / max(1, num_bins)
-    bins: List[Dict[str, Any]] = [{"count":0.0, "coverage":0, "mhz_start": (f0 + i*width)/1e6, "mhz_end": (f0 + (i+1)*width)/1e6} for i in range(num_bins)]
-    for r in dets:
-        try: fc = float(r['f_center_hz'])
-        except Exception: continue
-        if fc < f0 or fc >= f1: continue
-        idx = int((fc - f0) // width); idx = max(0, min(num_bins-1, idx)); bins[idx]["count"] += 1.0
-    for i in range(num_bins):
-        b_start = f0 + i*width; b_end   = f0 + (i+1)*width; cov = 0
-        for s in scans:
-            try: s0 = float(s['f_start_hz']); s1 = float(s['f_stop_hz'])
-            except Exception: continue
-            if (s0 < b_end) and (s1 > b_start): cov += 1
-        bins[i]["coverage"] = cov
-        bins[i]["count"] = bins[i]["count"] / float(cov) if cov>0 else 0.0
+    # Detection counts in one histogram pass. The fetched tuple rows convert
+    # to an array in one C-level np.asarray call — no per-row Python floats.
+    fc = np.asarray(dets, dtype=np.float64).reshape(-1)
+    fc = fc[(fc >= f0) & (fc < f1)]
+    idx = np.clip(((fc - f0) / width).astype(np.int64), 0, num_bins - 1)
+    counts = np.bincount(idx, minlength=num_bins).astype(np.float64)
+    # Scan coverage as a difference array: a scan overlapping bins [i0, i1)
+    # adds +1 at i0 and -1 at i1, and a prefix sum yields per-bin coverage
+    # in O(bins + scans) instead of the old O(bins * scans) nested loop.
+    sarr = np.asarray(scans, dtype=np.float64).reshape(-1, 2)
+    s0 = sarr[:, 0]
+    s1 = sarr[:, 1]
+    i0 = np.clip(np.floor((s0 - f0) / width), 0, num_bins).astype(np.int64)
+    i1 = np.clip(np.ceil((s1 - f0) / width), 0, num_bins).astype(np.int64)
+    delta = np.bincount(i0, minlength=num_bins + 1) - np.bincount(i1, minlength=num_bins + 1)
+    coverage = np.cumsum(delta)[:num_bins]
+    avg = np.where(coverage > 0, counts / np.maximum(coverage, 1), 0.0)
+    bins: List[Dict[str, Any]] = [
+        {"count": float(avg[i]), "coverage": int(coverage[i]),
+         "mhz_start": (f0 + i*width)/1e6, "mhz_end": (f0 + (i+1)*width)/1e6}
+        for i in range(num_bins)
+    ]
     maxc = _scale_counts_to_px(bins, "count")
     return bins, f0/1e6, f1/1e6, maxc
 
@@ -167,6 +262,37 @@ def strongest_signals(con: sqlite3.Connection, limit: int = 10):
         LIMIT ?
     """, (limit,))
 
+# ================================
+# Bar markup pre-rendering
+# ================================
+# Each bar loop in dashboard.html cost Jinja ~8 separate emit/substitute ops
+# per iteration. Joining one f-string per bar in Python and emitting the
+# result through a single {{ ...|safe }} keeps the template opcode count
+# flat regardless of bin count. All interpolated values are numeric, so no
+# escaping is needed.
+
+def _snr_bars_html(snr_hist: List[Dict[str, Any]]) -> str:
+    return ''.join(
+        f'<div class="flex flex-col items-center" title="{b["count"]} detections">'
+        f'<div class="w-6 bar rounded-t" style="height: {b["height_px"]}px;"></div>'
+        f'<div class="text-[10px] muted rotate-45 origin-top-left -mt-1">{b["label"]}</div>'
+        '</div>'
+        for b in snr_hist)
+
+def _freq_bars_html(freq_bins: List[Dict[str, Any]]) -> str:
+    return ''.join(
+        f'<div class="flex flex-col items-center" title="{b["mhz_start"]:.3f}–{b["mhz_end"]:.3f} MHz: {b["count"]}">'
+        f'<div class="w-3 bar rounded-t" style="height: {b["height_px"]}px;"></div>'
+        '</div>'
+        for b in freq_bins)
+
+def _avg_bars_html(avg_bins: List[Dict[str, Any]]) -> str:
+    return ''.join(
+        f'<div class="flex flex-col items-center" title="{b["mhz_start"]:.3f}–{b["mhz_end"]:.3f} MHz: avg {b["count"]:.2f} ({b["coverage"]} scans)">'
+        f'<div class="w-3 bar rounded-t" style="height: {b["height_px"]}px;"></div>'
+        '</div>'
+        for b in avg_bins)
+
 # ================================
 # Controller HTTP client
 # ================================
@@ -219,18 +345,142 @@ class ControllerClient:
         params = {"tail": int(tail)} if tail else None
         return self._req('GET', f'/jobs/{job_id}/logs', params=params, want_text=True)
 
+    def job_logs_from(self, job_id: str, offset: int = 0) -> Tuple[str, int, bool]:
+        # Cursor read: only bytes past `offset`, new cursor in X-Log-Offset.
+        # Uses urlopen directly because _req discards response headers.
+        url = f"{self.base}/jobs/{job_id}/logs?offset={int(offset)}"
+        headers = {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        req = urlreq.Request(url, headers=headers)
+        try:
+            with urlreq.urlopen(req, timeout=10) as resp:
+                text = resp.read().decode('utf-8', errors='replace')
+                new_offset = int(resp.headers.get('X-Log-Offset') or 0)
+                reset = resp.headers.get('X-Log-Reset') == '1'
+                return text, new_offset, reset
+        except urlerr.HTTPError as e:
+            raise RuntimeError(f"controller HTTP {e.code}: {e.read().decode('utf-8', errors='replace')}")
+        except Exception as e:
+            raise RuntimeError(str(e))
+
 # ================================
 # Flask app
 # ================================
 
+PAGE_TEMPLATES = ("base.html", "dashboard.html", "detections.html", "scans.html",
+                  "baseline.html", "control.html")
+
+
 def create_app(db_path: str) -> Flask:
     app = Flask(__name__, template_folder='templates', static_folder='static')
-    app._con = open_db_ro(db_path)
+    # Compile each template exactly once: auto_reload stats the template file
+    # on every render to check for edits, and the default cache (50 entries)
+    # could evict under pressure. Warming at startup keeps first hits off the
+    # Jinja lex/parse/compile path too.
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    # The stylesheet ships with the app, so clients may cache it for a year.
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+    if HAVE_COMPRESS:
+        # text/event-stream deliberately excluded: compressing a long-poll
+        # stream buffers it and defeats incremental delivery.
+        app.config.setdefault('COMPRESS_MIMETYPES',
+                              ['text/html', 'text/css', 'text/plain', 'application/json'])
+        app.config.setdefault('COMPRESS_LEVEL', 5)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+        Compress(app)
+    app.jinja_env.auto_reload = False
+    app.jinja_env.cache_size = 400
+    # Each {% for %}/{% if %} line otherwise compiles to an extra literal
+    # whitespace write per iteration; trimming drops those from the
+    # generated code (and a little from every response body).
+    app.jinja_env.trim_blocks = True
+    app.jinja_env.lstrip_blocks = True
+    app.jinja_env.keep_trailing_newline = False
+    # Persist compiled templates across process restarts so cold starts
+    # (reloads, CI) just marshal.loads cached bytecode instead of
+    # recompiling; the warm-up loop below then populates this on first run.
+    try:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'sdrwatch_jinja')
+        os.makedirs(cache_dir, exist_ok=True)
+        # Bump the pattern suffix when env compile options change: the
+        # bytecode cache keys on template source only, so stale entries
+        # compiled under old trim/lstrip settings would otherwise be reused.
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+            directory=cache_dir, pattern='__jinja2_v2_%s.cache')
+    except Exception:
+        pass  # an unwritable tmpdir just means in-process caching only
+    for t in PAGE_TEMPLATES:
+        try:
+            app.jinja_env.get_template(t)
+        except Exception:
+            pass  # missing/broken template surfaces on first use as before
     app._db_path = db_path
     app._ctl = ControllerClient(CONTROL_URL, CONTROL_TOKEN)
     app._current_job = None
 
-    def con(): return app._con
+    # One read-only connection per serving thread: sqlite3 serializes all
+    # statements on a shared connection, so a single handle makes concurrent
+    # requests queue behind each other's queries.
+    local = threading.local()
+    all_cons: List[sqlite3.Connection] = []
+    cons_lock = threading.Lock()
+
+    def con() -> sqlite3.Connection:
+        c = getattr(local, 'con', None)
+        if c is None:
+            c = open_db_ro(app._db_path)
+            local.con = c
+            with cons_lock:
+                all_cons.append(c)
+        return c
+
+    @atexit.register
+    def _close_cons():
+        with cons_lock:
+            for c in all_cons:
+                try: c.close()
+                except Exception: pass
+            all_cons.clear()
+
+    # Dedicated connection for the data_version probe. The counter is
+    # per-connection, so reading it through the per-thread handles would
+    # give each worker thread its own sequence and version-keyed caches
+    # would miss whenever the thread pool rotated.
+    meta_con = open_db_ro(db_path)
+
+    def db_version() -> int:
+        return int(meta_con.execute("PRAGMA data_version").fetchone()['data_version'])
+
+    # Memo for repeated aggregate queries (COUNT(*), DISTINCT lists),
+    # flushed when the database changes. The dashboard has its own
+    # whole-page cache; this covers /detections and /scans, whose totals
+    # were recomputed by full scans on every page view.
+    agg_lock = threading.Lock()
+    agg_cache: Dict[Tuple[str, Tuple[Any, ...]], Any] = {}
+    agg_dv: List[Optional[int]] = [None]
+
+    def _agg_cached(fn, sql: str, params: Tuple[Any, ...] = ()):
+        dv = db_version()
+        key = (sql, params)
+        with agg_lock:
+            if dv != agg_dv[0]:
+                agg_cache.clear()
+                agg_dv[0] = dv
+            elif key in agg_cache:
+                return agg_cache[key]
+        val = fn(con(), sql, params)
+        with agg_lock:
+            if dv == agg_dv[0]:
+                agg_cache[key] = val
+        return val
+
+    def q1_cached(sql: str, params: Tuple[Any, ...] = ()):
+        return _agg_cached(q1, sql, params)
+
+    def qa_cached(sql: str, params: Tuple[Any, ...] = ()):
+        return _agg_cached(qa, sql, params)
 
     def require_auth():
         if not API_TOKEN: return
@@ -243,8 +493,19 @@ def create_app(db_path: str) -> Flask:
     def control():
         return render_template("control.html", db_path=app._db_path)
 
+    # Rendered dashboard keyed on (PRAGMA data_version, wall-clock hour).
+    # data_version bumps whenever another connection commits, and this handle
+    # is read-only, so an unchanged value means every DB-derived input is
+    # identical; the hour component covers detections_by_hour's timeline,
+    # which shifts at hour boundaries without any write. Holds one entry.
+    _dash_cache: Dict[Tuple[int, int], str] = {}
+
     @app.route('/')
     def dashboard():
+        dash_key = (db_version(), int(time.time() // 3600))
+        cached = _dash_cache.get(dash_key)
+        if cached is not None:
+            return Response(cached, mimetype="text/html")
         scans_total = q1(con(), "SELECT COUNT(*) AS c FROM scans")['c'] or 0
         detections_total = q1(con(), "SELECT COUNT(*) AS c FROM detections")['c'] or 0
         baseline_total = q1(con(), "SELECT COUNT(*) AS c FROM baseline")['c'] or 0
@@ -255,8 +516,7 @@ def create_app(db_path: str) -> Flask:
         by_hour = detections_by_hour(con(), hours=24)
         top_services = qa(con(), "SELECT COALESCE(service,'Unknown') AS service, COUNT(*) AS count FROM detections GROUP BY COALESCE(service,'Unknown') ORDER BY count DESC LIMIT 10")
         strongest = strongest_signals(con(), limit=10)
-        return render_template(
-            "dashboard.html",
+        ctx = dict(
             scans_total=scans_total,
             detections_total=detections_total,
             baseline_total=baseline_total,
@@ -274,7 +534,17 @@ def create_app(db_path: str) -> Flask:
             top_services=top_services,
             strongest=strongest,
             chart_px=CHART_HEIGHT_PX,
+            snr_bars_html=_snr_bars_html(snr_hist),
+            freq_bars_html=_freq_bars_html(freq_bins),
+            avg_bars_html=_avg_bars_html(avg_bins),
         )
+        # Render fully (no streaming) so the result can be cached: polling
+        # clients mean misses are rare, and a buffered miss is cheaper than
+        # re-running every aggregate query per hit.
+        html = render_template("dashboard.html", **ctx)
+        _dash_cache.clear()
+        _dash_cache[dash_key] = html
+        return Response(html, mimetype="text/html")
 
     @app.route('/detections')
     def detections():
@@ -284,6 +554,9 @@ def create_app(db_path: str) -> Flask:
         fmin = args.get('f_min_mhz')
         fmax = args.get('f_max_mhz')
         hours = args.get('since_hours')
+        # Filters append in this fixed order so the assembled SQL depends
+        # only on which are active; sqlite3's statement cache then reuses
+        # the prepared plan for each filter combination.
         where = []
         params: List[Any] = []
         if service:
@@ -299,22 +572,53 @@ def create_app(db_path: str) -> Flask:
         where_sql = (" WHERE "+" AND ".join(where)) if where else ""
         page = max(1, int(float(args.get('page',1))))
         page_size = min(200, max(10, int(float(args.get('page_size',50)))))
-        total = q1(con(), f"SELECT COUNT(*) AS c FROM detections{where_sql}", tuple(params))['c']
-        offset = (page-1)*page_size
-        rows = qa(con(), f"""
-            SELECT time_utc, scan_id, f_center_hz, f_low_hz, f_high_hz,
+        total_sql = f"SELECT COUNT(*) AS c FROM detections{where_sql}"
+        total_approx = False
+        if not where:
+            # detections is append-only (nothing in the code base deletes
+            # rows), so MAX(rowid) tracks COUNT(*) while costing one b-tree
+            # seek instead of a full index walk. Displayed as ~N since
+            # rowid gaps are possible in principle.
+            total = q1(con(), "SELECT COALESCE(MAX(rowid), 0) AS c FROM detections")['c']
+            total_approx = True
+        elif hours not in (None, ''):
+            # datetime('now', ...) predicates drift with the clock, so a
+            # version-keyed memo could serve stale counts; run those fresh.
+            total = q1(con(), total_sql, tuple(params))['c']
+        else:
+            total = q1_cached(total_sql, tuple(params))['c']
+        before_t = args.get('before_t') or None
+        before_id = args.get('before_id')
+        select_sql = """
+            SELECT rowid AS rid, time_utc, scan_id, f_center_hz, f_low_hz, f_high_hz,
                    peak_db, noise_db, snr_db, service, region, notes
-            FROM detections {where_sql}
-            ORDER BY time_utc DESC
-            LIMIT ? OFFSET ?
-        """, tuple(params)+(page_size, offset))
-        sv = [r['service'] for r in qa(con(), "SELECT DISTINCT COALESCE(service,'Unknown') AS service FROM detections ORDER BY service")]
+            FROM detections"""
+        if before_t and before_id not in (None, ''):
+            # Keyset page: the Next button carries the last row's
+            # (time_utc, rowid) cursor, so SQLite seeks straight to it in
+            # the index — O(page_size) at any depth, where OFFSET visits
+            # and discards every earlier row. rowid breaks ties between
+            # detections sharing a timestamp.
+            cursor_where = where + ["(time_utc, rowid) < (?, ?)"]
+            rows = qa(con(), f"""{select_sql}
+                WHERE {" AND ".join(cursor_where)}
+                ORDER BY time_utc DESC, rowid DESC
+                LIMIT ?
+            """, tuple(params)+(before_t, int(float(before_id)), page_size))
+        else:
+            # First page, Prev, or a direct ?page=N jump: OFFSET fallback.
+            offset = (page-1)*page_size
+            rows = qa(con(), f"""{select_sql} {where_sql}
+                ORDER BY time_utc DESC, rowid DESC
+                LIMIT ? OFFSET ?
+            """, tuple(params)+(page_size, offset))
+        sv = [r['service'] for r in qa_cached("SELECT DISTINCT COALESCE(service,'Unknown') AS service FROM detections ORDER BY service")]
         qs = args.to_dict(flat=True)
         qs = "&".join([f"{k}={v}" for k,v in qs.items()])
         return render_template(
             "detections.html",
             rows=rows, page_num=page, page_size=page_size, total=total,
-            services=sv, req_args=args, qs=qs
+            total_approx=total_approx, services=sv, req_args=args, qs=qs
         )
 
     @app.route('/scans')
@@ -322,14 +626,26 @@ def create_app(db_path: str) -> Flask:
         args = request.args
         page = max(1, int(float(args.get('page',1))))
         page_size = min(200, max(10, int(float(args.get('page_size',25)))))
-        total = q1(con(), "SELECT COUNT(*) AS c FROM scans")['c']
-        offset = (page-1)*page_size
-        rows = qa(con(), """
-            SELECT id, t_start_utc, t_end_utc, f_start_hz, f_stop_hz, step_hz, samp_rate, fft, avg, device, driver
-            FROM scans
-            ORDER BY COALESCE(t_end_utc,t_start_utc) DESC
-            LIMIT ? OFFSET ?
-        """, (page_size, offset))
+        total = q1_cached("SELECT COUNT(*) AS c FROM scans")['c']
+        before_t = args.get('before_t') or None
+        before_id = args.get('before_id')
+        select_sql = """
+            SELECT id, t_start_utc, t_end_utc, COALESCE(t_end_utc,t_start_utc) AS sort_t,
+                   f_start_hz, f_stop_hz, step_hz, samp_rate, fft, avg, device, driver
+            FROM scans"""
+        if before_t and before_id not in (None, ''):
+            # Same keyset cursor as /detections, on the listing's sort key.
+            rows = qa(con(), f"""{select_sql}
+                WHERE (COALESCE(t_end_utc,t_start_utc), id) < (?, ?)
+                ORDER BY sort_t DESC, id DESC
+                LIMIT ?
+            """, (before_t, int(float(before_id)), page_size))
+        else:
+            offset = (page-1)*page_size
+            rows = qa(con(), f"""{select_sql}
+                ORDER BY sort_t DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, (page_size, offset))
         return render_template(
             "scans.html",
             rows=rows, page_num=page, page_size=page_size, total=total, req_args=args
@@ -363,20 +679,33 @@ def create_app(db_path: str) -> Flask:
         if args.get('f_max_mhz'): where.append("f_center_hz <= ?"); params.append(int(float(args.get('f_max_mhz'))*1e6))
         if args.get('since_hours'): where.append("time_utc >= datetime('now', ?)"); params.append(f"-{int(float(args.get('since_hours')))} hours")
         where_sql = (" WHERE "+" AND ".join(where)) if where else ""
-        rows = qa(con(), f"""
-            SELECT time_utc, scan_id, f_center_hz, f_low_hz, f_high_hz,
-                   peak_db, noise_db, snr_db, service, region, notes
+        fieldnames = ["time_utc","scan_id","f_center_hz","f_low_hz","f_high_hz","peak_db","noise_db","snr_db","service","region","notes"]
+        # Stream instead of materializing: the old path fetched up to 100k
+        # dict rows, wrote them all into a StringIO, then copied that out —
+        # peak memory around 3x the CSV and nothing sent until the end. A
+        # tuple-row cursor drained in batches keeps memory flat and lets the
+        # download start immediately.
+        cur = con().cursor()
+        cur.row_factory = None  # type: ignore[assignment]
+        cur.execute(f"""
+            SELECT {", ".join(fieldnames)}
             FROM detections {where_sql}
             ORDER BY time_utc DESC
             LIMIT 100000
         """, tuple(params))
-        import csv
-        buf = io.StringIO()
-        fieldnames = ["time_utc","scan_id","f_center_hz","f_low_hz","f_high_hz","peak_db","noise_db","snr_db","service","region","notes"]
-        w = csv.DictWriter(buf, fieldnames=fieldnames); w.writeheader()
-        for r in rows: w.writerow({k:r.get(k,'') for k in fieldnames})
-        buf.seek(0)
-        return Response(buf.read(), mimetype='text/csv', headers={'Content-Disposition':'attachment; filename=detections.csv'})
+
+        class _Echo:
+            def write(self, s): return s
+
+        def gen():
+            w = csv.writer(_Echo())
+            yield w.writerow(fieldnames)
+            while True:
+                batch = cur.fetchmany(1000)
+                if not batch:
+                    break
+                yield ''.join(map(w.writerow, batch))
+        return Response(gen(), mimetype='text/csv', headers={'Content-Disposition':'attachment; filename=detections.csv'})
 
     # ---------- Controller proxy API ----------
     @app.get('/ctl/devices')
@@ -443,14 +772,18 @@ def create_app(db_path: str) -> Flask:
 
     @app.get('/api/logs')
     def api_logs():
+        # Incremental poll: the client sends the byte offset it has already
+        # rendered and appends only what came after, instead of the old
+        # re-download of the full 500-line tail every second.
         job_id = app._current_job
+        offset = request.args.get('offset', type=int) or 0
         if not job_id:
-            return Response("", mimetype='text/plain')
+            return jsonify({"text": "", "offset": 0, "reset": offset > 0, "job": None})
         try:
-            txt = app._ctl.job_logs(job_id, tail=500)
-            return Response(txt, mimetype='text/plain')
+            text, new_offset, reset = app._ctl.job_logs_from(job_id, offset)
+            return jsonify({"text": text, "offset": new_offset, "reset": reset, "job": job_id})
         except Exception:
-            return Response("", mimetype='text/plain')
+            return jsonify({"text": "", "offset": offset, "reset": False, "job": job_id})
 
     return app
 
@@ -463,10 +796,22 @@ def parse_args():
     ap.add_argument('--db', required=True)
     ap.add_argument('--host', default='0.0.0.0')
     ap.add_argument('--port', type=int, default=8080)
+    ap.add_argument('--dev', action='store_true', help='Run the Flask dev server instead of waitress')
     return ap.parse_args()
 
 if __name__ == '__main__':
     args = parse_args()
     app = create_app(args.db)
-    app.run(host=args.host, port=args.port, threaded=True)
+    if args.dev:
+        app.run(host=args.host, port=args.port, threaded=True)
+    else:
+        try:
+            from waitress import serve  # type: ignore
+        except ImportError:
+            # Dev-server fallback: werkzeug spawns an unbounded thread per
+            # connection; fine for trying things out, not for leaving up.
+            app.run(host=args.host, port=args.port, threaded=True)
+        else:
+            serve(app, host=args.host, port=args.port, threads=16,
+                  channel_timeout=120)
 
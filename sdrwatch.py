@@ -36,12 +36,17 @@ MIT (this file)
 """
 
 import argparse
+import atexit
 import csv
+import ctypes
+import functools
+import json
 import math
 import os
 import sqlite3
 import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Dict, Iterable, List, Optional, Tuple
@@ -73,6 +78,53 @@ try:
 except Exception:
     HAVE_RTLSDR = False
 
+# pyFFTW is optional: when present, register it as the scipy.fft backend so
+# Welch reuses cached FFTW plans instead of re-planning every sweep window.
+try:
+    import pyfftw  # type: ignore
+    import scipy.fft as _scipy_fft  # type: ignore
+
+    pyfftw.interfaces.cache.enable()
+    _scipy_fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+    HAVE_PYFFTW = True
+except Exception:
+    HAVE_PYFFTW = False
+
+# Numba is optional: when present, the segment run-length walk is JIT-compiled
+# to native code instead of going through the NumPy edge-merge path.
+try:
+    import numba  # type: ignore
+
+    HAVE_NUMBA = True
+except Exception:
+    HAVE_NUMBA = False
+
+# CuPy is optional: enables the --gpu PSD path (batched cuFFT).
+try:
+    import cupy as cp  # type: ignore
+
+    HAVE_CUPY = True
+except Exception:
+    HAVE_CUPY = False
+
+# A compiled helper module is optional: if a sdrwatch_ext extension (Cython/C,
+# built separately) providing walk_segments(mask_u8, guard, min_width) ->
+# (starts, ends) is importable, the detector prefers it over Numba/NumPy.
+try:
+    import sdrwatch_ext  # type: ignore
+
+    HAVE_EXT = hasattr(sdrwatch_ext, "walk_segments")
+except Exception:
+    HAVE_EXT = False
+
+# orjson is optional: C-implemented JSON serializer for the --jsonl sink.
+try:
+    import orjson  # type: ignore
+
+    HAVE_ORJSON = True
+except Exception:
+    HAVE_ORJSON = False
+
 # ------------------------------
 # Utility
 # ------------------------------
@@ -82,16 +134,23 @@ def utc_now_str() -> str:
 
 
 def db10(x: np.ndarray) -> np.ndarray:
-    # avoid log(0)
-    return 10.0 * np.log10(np.maximum(x, 1e-20))
+    # avoid log(0); keep the result in float32 — dB-scale detection doesn't
+    # need double precision and f32 halves memory traffic on the PSD path
+    return (10.0 * np.log10(np.maximum(x, np.float32(1e-20)))).astype(np.float32, copy=False)
 
 
 def robust_noise_floor_db(psd_db: np.ndarray) -> float:
     """Robust noise floor estimate using median + 1.4826*MAD (approx std for Gaussian).
+
+    Medians via np.partition (O(N) selection) rather than full sorts.
     """
-    med = np.median(psd_db)
-    mad = np.median(np.abs(psd_db - med))
-    return float(med + 1.4826 * mad)
+    n = psd_db.size
+    if n == 0:
+        return 0.0
+    med = float(np.partition(psd_db, n // 2)[n // 2])
+    dev = np.abs(psd_db - med)
+    mad = float(np.partition(dev, n // 2)[n // 2])
+    return med + 1.4826 * mad
 
 
 @dataclass
@@ -131,6 +190,23 @@ class Bandplan:
                 Band(1_420_000_000, 1_427_000_000, "Radio Astronomy", "Global", "Hydrogen line"),
                 Band(88_000_000, 108_000_000, "FM Broadcast", "Global", "88-108 MHz Radio"),
             ]
+        self._build_index()
+
+    def _build_index(self):
+        """Sort bands by low edge into a struct-of-arrays layout.
+
+        Parallel int64 edge arrays drive the binary search; service/region/
+        notes live in parallel Python lists. The Band dataclass only exists
+        transiently during loading — no per-compare attribute dereferences.
+        """
+        order = sorted(range(len(self.bands)), key=lambda i: self.bands[i].low_hz)
+        n = len(order)
+        self.low = np.fromiter((self.bands[i].low_hz for i in order), dtype=np.int64, count=n)
+        self.high = np.fromiter((self.bands[i].high_hz for i in order), dtype=np.int64, count=n)
+        self.svc: List[str] = [self.bands[i].service for i in order]
+        self.reg: List[str] = [self.bands[i].region for i in order]
+        self.note: List[str] = [self.bands[i].notes for i in order]
+        self.bands = []  # free the AoS copy; the index owns the data now
 
     def _load_csv(self, path: str):
         with open(path, newline="", encoding="utf-8") as f:
@@ -155,22 +231,128 @@ class Bandplan:
                     continue
 
     def lookup(self, f_hz: int) -> Tuple[str, str, str]:
-        for b in self.bands:
-            if b.low_hz <= f_hz <= b.high_hz:
-                return b.service, b.region, b.notes
+        # Binary search on the sorted low edges: the candidate interval is the
+        # last band whose low edge is <= f. O(log n) vs the old linear scan.
+        idx = int(np.searchsorted(self.low, f_hz, side="right")) - 1
+        if idx >= 0 and f_hz <= int(self.high[idx]):
+            return self.svc[idx], self.reg[idx], self.note[idx]
         return "", "", ""
 
+    def lookup_many(self, freqs_hz: np.ndarray) -> List[Tuple[str, str, str]]:
+        """Vectorized lookup for an array of frequencies (one searchsorted call)."""
+        freqs = np.asarray(freqs_hz, dtype=np.int64)
+        idx = np.searchsorted(self.low, freqs, side="right") - 1
+        # Mask-based validity check in bulk, then gather from the SoA lists.
+        valid = (idx >= 0) & (freqs <= self.high[np.clip(idx, 0, max(0, self.high.size - 1))]) if self.high.size else np.zeros(freqs.size, dtype=bool)
+        out: List[Tuple[str, str, str]] = []
+        for i, ok in zip(idx.tolist(), valid.tolist()):
+            if ok:
+                out.append((self.svc[i], self.reg[i], self.note[i]))
+            else:
+                out.append(("", "", ""))
+        return out
+
 # ------------------------------
 # SQLite store
 # ------------------------------
 
+# Hot-path SQL kept as module constants so the connection's statement cache
+# always sees identical text and never re-prepares.
+SQL_INSERT_DETECTIONS = (
+    "INSERT INTO detections(scan_id, time_utc, f_center_hz, f_low_hz, f_high_hz, "
+    "peak_db, noise_db, snr_db, service, region, notes) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
 class Store:
+    # Flush the in-memory baseline to SQLite every this many window updates.
+    BASELINE_FLUSH_EVERY = 16
+
     def __init__(self, path: str):
-        self.con = sqlite3.connect(path)
+        # check_same_thread=False: per-window writes run on the sweep worker
+        # thread while start/end-of-scan bookkeeping stays on the main thread.
+        # Access is handed off, never concurrent.
+        self.con = sqlite3.connect(path, check_same_thread=False)
         self._init()
+        # One long-lived cursor for the hot paths; combined with constant SQL
+        # text this keeps statements in sqlite3's prepared-statement cache.
+        self.cur = self.con.cursor()
+        self._load_baseline()
+        atexit.register(self.flush_baseline)
+
+    def _load_baseline(self):
+        """Mirror the baseline table into parallel NumPy arrays.
+
+        The sweep loop updates these in place with vectorized EMA math and
+        only the dirty rows hit SQLite, every BASELINE_FLUSH_EVERY windows
+        (and at end of scan). External readers therefore see the baseline at
+        most one flush interval behind.
+        """
+        rows = self.con.execute(
+            "SELECT bin_hz, ema_occ, ema_power_db, total_obs, hits FROM baseline ORDER BY bin_hz"
+        ).fetchall()
+        n = len(rows)
+        cap = max(16, n)
+        self._bl_bins = np.zeros(cap, dtype=np.int64)
+        self._bl_occ = np.zeros(cap, dtype=np.float64)
+        self._bl_pow = np.zeros(cap, dtype=np.float64)
+        self._bl_total = np.zeros(cap, dtype=np.int64)
+        self._bl_hits = np.zeros(cap, dtype=np.int64)
+        self._bl_seen_ts = np.zeros(cap, dtype=np.float64)
+        self._bl_dirty = np.zeros(cap, dtype=bool)
+        self._bl_count = n
+        self._bl_index: Dict[int, int] = {}
+        for i, (b, occ, p, tot, hits) in enumerate(rows):
+            self._bl_bins[i] = b
+            self._bl_occ[i] = occ if occ is not None else 0.0
+            self._bl_pow[i] = p if p is not None else 0.0
+            self._bl_total[i] = tot if tot is not None else 0
+            self._bl_hits[i] = hits if hits is not None else 0
+            self._bl_index[int(b)] = i
+        # Windows revisit identical bin grids every sweep; cache the resolved
+        # index array per (first, last, size) grid signature.
+        self._bl_idx_cache: Dict[Tuple[int, int, int], np.ndarray] = {}
+        self._bl_updates_since_flush = 0
+
+    def _grow_baseline(self, need: int):
+        cap = self._bl_bins.size
+        new_cap = max(cap * 2, self._bl_count + need)
+        for name in ("_bl_bins", "_bl_occ", "_bl_pow", "_bl_total", "_bl_hits", "_bl_seen_ts", "_bl_dirty"):
+            old = getattr(self, name)
+            arr = np.zeros(new_cap, dtype=old.dtype)
+            arr[: self._bl_count] = old[: self._bl_count]
+            setattr(self, name, arr)
+
+    def _baseline_indices(self, bins: np.ndarray) -> np.ndarray:
+        key = (int(bins[0]), int(bins[-1]), bins.size) if bins.size else (0, 0, 0)
+        idx = self._bl_idx_cache.get(key)
+        if idx is not None:
+            return idx
+        out = np.empty(bins.size, dtype=np.int64)
+        index = self._bl_index
+        for k, b in enumerate(bins.tolist()):
+            i = index.get(b)
+            if i is None:
+                if self._bl_count >= self._bl_bins.size:
+                    self._grow_baseline(bins.size)
+                i = self._bl_count
+                self._bl_bins[i] = b
+                index[b] = i
+                self._bl_count += 1
+            out[k] = i
+        self._bl_idx_cache[key] = out
+        return out
 
     def _init(self):
         cur = self.con.cursor()
+        # WAL + relaxed sync: readers (query tools, dashboard) don't block the
+        # sweep loop and per-transaction fsync cost drops sharply.
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS scans (
@@ -205,6 +387,41 @@ class Store:
             )
             """
         )
+        # The dashboard's hourly/time-window queries filter on time_utc;
+        # without this index SQLite scans the whole detections table per
+        # page load. ISO-8601 text sorts chronologically, so a plain index
+        # makes the range predicate sargable.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_time ON detections(time_utc)"
+        )
+        # Serves the dashboard's top-10 strongest-signals card and the
+        # min_snr filter: ORDER BY snr_db DESC LIMIT N walks the index tail
+        # instead of sorting the table. Partial, since NULL snr rows are
+        # excluded by every consumer anyway.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_snr "
+            "ON detections(snr_db DESC) WHERE snr_db IS NOT NULL"
+        )
+        # Composite indexes for the web UI's filtered listings, which all
+        # ORDER BY time_utc DESC: the leading column matches the filter
+        # expression exactly (the service filter compares
+        # COALESCE(service,'Unknown'), so a plain service index would not
+        # be sargable) and the trailing time column hands the planner the
+        # sort order for free.
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_service_time "
+            "ON detections(COALESCE(service,'Unknown'), time_utc DESC)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_freq_time "
+            "ON detections(f_center_hz, time_utc DESC)"
+        )
+        # Schema note: bin_hz as INTEGER PRIMARY KEY aliases the rowid, so
+        # point lookups and upserts already run against a single B-tree.
+        # A WITHOUT ROWID variant keyed by a compact grid index (bin_id =
+        # (f - f_ref) / df) was evaluated and rejected: SQLite gains nothing
+        # for a lone integer PK, and the query CLI and web dashboard both
+        # address this table by absolute bin_hz.
         cur.execute(
             """
             CREATE TABLE IF NOT EXISTS baseline (
@@ -252,66 +469,100 @@ class Store:
         return int(cur.lastrowid)
 
     def end_scan(self, scan_id: int, t_end_utc: str):
+        self.flush_baseline()
         self.con.execute("UPDATE scans SET t_end_utc = ? WHERE id = ?", (t_end_utc, scan_id))
         self.con.commit()
 
-    def add_detection(self, scan_id: int, seg: Segment, service: str, region: str, notes: str):
-        self.con.execute(
-            """
-            INSERT INTO detections(scan_id, time_utc, f_center_hz, f_low_hz, f_high_hz, peak_db, noise_db, snr_db, service, region, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                scan_id,
-                utc_now_str(),
-                seg.f_center_hz,
-                seg.f_low_hz,
-                seg.f_high_hz,
-                seg.peak_db,
-                seg.noise_db,
-                seg.snr_db,
-                service,
-                region,
-                notes,
-            ),
+    def add_detections(self, scan_id: int, dets: List[Tuple[Segment, str, str, str]]):
+        """Insert all detections for one window in a single executemany."""
+        if not dets:
+            return
+        tnow = utc_now_str()
+        self.cur.executemany(
+            SQL_INSERT_DETECTIONS,
+            [
+                (
+                    scan_id,
+                    tnow,
+                    seg.f_center_hz,
+                    seg.f_low_hz,
+                    seg.f_high_hz,
+                    seg.peak_db,
+                    seg.noise_db,
+                    seg.snr_db,
+                    service,
+                    region,
+                    notes,
+                )
+                for seg, service, region, notes in dets
+            ],
         )
 
     def update_baseline(self, freqs_hz: np.ndarray, psd_db: np.ndarray, occupied_mask: np.ndarray, ema_alpha: float = 0.05):
-        cur = self.con.cursor()
-        tnow = utc_now_str()
-        for f, p, occ in zip(freqs_hz.astype(int), psd_db.astype(float), occupied_mask.astype(int)):
-            cur.execute("SELECT ema_occ, ema_power_db, last_seen_utc, total_obs, hits FROM baseline WHERE bin_hz = ?", (int(f),))
-            row = cur.fetchone()
-            if row is None:
-                ema_occ = occ
-                ema_pow = p
-                tot = 1
-                hits = occ
-            else:
-                ema_occ_prev, ema_pow_prev, _, total_obs, hits_prev = row
-                ema_occ = (1 - ema_alpha) * (ema_occ_prev if ema_occ_prev is not None else 0.0) + ema_alpha * occ
-                ema_pow = (1 - ema_alpha) * (ema_pow_prev if ema_pow_prev is not None else p) + ema_alpha * p
-                tot = (total_obs or 0) + 1
-                hits = (hits_prev or 0) + occ
-            cur.execute(
-                """
-                INSERT INTO baseline(bin_hz, ema_occ, ema_power_db, last_seen_utc, total_obs, hits)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(bin_hz) DO UPDATE SET
-                    ema_occ=excluded.ema_occ,
-                    ema_power_db=excluded.ema_power_db,
-                    last_seen_utc=excluded.last_seen_utc,
-                    total_obs=excluded.total_obs,
-                    hits=excluded.hits
-                """,
-                (int(f), float(ema_occ), float(ema_pow), tnow, int(tot), int(hits)),
+        # Fully in-memory EMA update: no SQL statements on the per-window
+        # path. Dirty rows are checkpointed by flush_baseline.
+        a = float(ema_alpha)
+        bins = freqs_hz.astype(np.int64)
+        idx = self._baseline_indices(bins)
+        occ = occupied_mask.astype(np.float64)
+        pows = psd_db.astype(np.float64)
+        unseen = self._bl_total[idx] == 0
+        # First observation seeds both EMAs with the measurement itself
+        # (matching the INSERT arm of the old upsert); later windows blend.
+        self._bl_occ[idx] = np.where(
+            unseen, occ, (1.0 - a) * self._bl_occ[idx] + a * occ
+        )
+        self._bl_pow[idx] = np.where(
+            unseen, pows, (1.0 - a) * self._bl_pow[idx] + a * pows
+        )
+        self._bl_total[idx] += 1
+        self._bl_hits[idx] += occupied_mask.astype(np.int64)
+        self._bl_seen_ts[idx] = time.time()
+        self._bl_dirty[idx] = True
+        self._bl_updates_since_flush += 1
+        if self._bl_updates_since_flush >= self.BASELINE_FLUSH_EVERY:
+            self.flush_baseline()
+
+    def flush_baseline(self):
+        """Write dirty baseline rows to SQLite in one batched REPLACE."""
+        dirty = np.flatnonzero(self._bl_dirty[: self._bl_count])
+        if dirty.size == 0:
+            return
+        rows = [
+            (
+                int(self._bl_bins[i]),
+                float(self._bl_occ[i]),
+                float(self._bl_pow[i]),
+                datetime.fromtimestamp(self._bl_seen_ts[i], timezone.utc).isoformat(),
+                int(self._bl_total[i]),
+                int(self._bl_hits[i]),
             )
+            for i in dirty.tolist()
+        ]
+        self.cur.executemany(
+            "INSERT OR REPLACE INTO baseline(bin_hz, ema_occ, ema_power_db, last_seen_utc, total_obs, hits) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.con.commit()
+        self._bl_dirty[: self._bl_count] = False
+        self._bl_updates_since_flush = 0
 
     def baseline_occ(self, f_center_hz: int) -> Optional[float]:
-        cur = self.con.cursor()
-        cur.execute("SELECT ema_occ FROM baseline WHERE bin_hz = ?", (int(f_center_hz),))
-        row = cur.fetchone()
-        return float(row[0]) if row and row[0] is not None else None
+        i = self._bl_index.get(int(f_center_hz))
+        if i is None or self._bl_total[i] == 0:
+            return None
+        return float(self._bl_occ[i])
+
+    def baseline_occ_many(self, bins_hz: Iterable[int]) -> Dict[int, float]:
+        """Fetch ema_occ for many bins from the in-memory mirror."""
+        out: Dict[int, float] = {}
+        index = self._bl_index
+        for b in bins_hz:
+            i = index.get(int(b))
+            if i is not None and self._bl_total[i] > 0:
+                out[int(b)] = float(self._bl_occ[i])
+        return out
 
 
 # ------------------------------
@@ -339,26 +590,64 @@ class SDRSource:
             self.dev.setGain(SOAPY_SDR_RX, 0, float(gain))
         self.stream = self.dev.setupStream(SOAPY_SDR_RX, SOAPY_SDR_CF32)
         self.dev.activateStream(self.stream)
+        # Prefer the direct-access (zero-copy) buffer API when the driver
+        # exposes its DMA ring; readStream stages through an extra copy.
+        try:
+            self._direct = int(self.dev.getNumDirectAccessBuffers(self.stream)) > 0
+        except Exception:
+            self._direct = False
+        self._direct_buffs = [0]  # filled with buffer addresses by acquireReadBuffer
 
     def tune(self, center_hz: float):
         self.dev.setFrequency(SOAPY_SDR_RX, 0, center_hz)
 
-    def read(self, count: int) -> np.ndarray:
-        buffs = []
+    def _read_direct(self, buf: np.ndarray, count: int) -> int:
+        """RX via acquireReadBuffer/releaseReadBuffer (driver DMA ring).
+
+        Each acquired buffer is viewed in place with np.frombuffer and copied
+        once into the destination slice before release — no intermediate
+        staging buffer, unlike readStream.
+        """
+        got = 0
+        while got < count:
+            ret, handle, flags, time_ns = self.dev.acquireReadBuffer(
+                self.stream, self._direct_buffs, 100000
+            )
+            if ret <= 0:
+                time.sleep(0.001)
+                continue
+            n = int(min(ret, count - got))
+            raw = (ctypes.c_char * (int(ret) * 8)).from_address(int(self._direct_buffs[0]))
+            view = np.frombuffer(raw, dtype=np.complex64, count=int(ret))
+            buf[got:got + n] = view[:n]
+            self.dev.releaseReadBuffer(self.stream, handle)
+            got += n
+        return got
+
+    def read_into(self, buf: np.ndarray, count: int) -> int:
+        """Fill a caller-provided complex64 buffer in place (no per-call alloc)."""
+        if self._direct:
+            try:
+                return self._read_direct(buf, count)
+            except Exception:
+                # Driver advertised direct access but the call failed; fall
+                # back to readStream for the rest of the run.
+                self._direct = False
         got = 0
         while got < count:
             sr = int(min(8192, count - got))
-            buff = np.empty(sr, dtype=np.complex64)
-            st = self.dev.readStream(self.stream, [buff], sr)
+            st = self.dev.readStream(self.stream, [buf[got:got + sr]], sr)
             n = st.ret if hasattr(st, "ret") else st
             if n > 0:
-                buffs.append(buff[:n])
                 got += n
             else:
                 time.sleep(0.001)
-        if not buffs:
-            return np.zeros(count, dtype=np.complex64)
-        return np.concatenate(buffs)
+        return got
+
+    def read(self, count: int) -> np.ndarray:
+        buf = np.empty(count, dtype=np.complex64)
+        self.read_into(buf, count)
+        return buf
 
     def close(self):
         try:
@@ -384,6 +673,10 @@ class RTLSDRSource:
     def tune(self, center_hz: float):
         self.dev.center_freq = center_hz
 
+    def read_into(self, buf: np.ndarray, count: int) -> int:
+        buf[:count] = self.dev.read_samples(count)
+        return count
+
     def read(self, count: int) -> np.ndarray:
         # pyrtlsdr returns np.complex64
         return self.dev.read_samples(count)
@@ -413,16 +706,28 @@ def _sliding_window_view(x: np.ndarray, window: int) -> np.ndarray:
         return np.lib.stride_tricks.as_strided(x, shape=shape, strides=strides)
 
 
-def cfar_os_mask(psd_db: np.ndarray, train: int, guard: int, quantile: float, alpha_db: float) -> Tuple[np.ndarray, np.ndarray]:
+def cfar_os_mask(
+    psd_db: np.ndarray,
+    train: int,
+    guard: int,
+    quantile: float,
+    alpha_db: float,
+    psd_lin: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
     """Order-Statistic CFAR (OS-CFAR) on a 1D PSD in dB.
     Returns (mask_above, noise_est_db_per_bin). The threshold is noise_est + alpha_db, applied in **linear** power domain.
+    Pass psd_lin (the linear-power PSD) when available to skip re-exponentiating psd_db.
     """
     psd_db = np.asarray(psd_db).astype(np.float64)
     N = psd_db.size
     if N == 0:
         return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.float64)
-    # Convert to linear power
-    psd_lin = np.power(10.0, psd_db / 10.0)
+    # Linear power: reuse the caller's array when provided (the estimator
+    # already has it), otherwise undo the dB conversion.
+    if psd_lin is None:
+        psd_lin = np.power(10.0, psd_db / 10.0)
+    else:
+        psd_lin = np.asarray(psd_lin).astype(np.float64)
     # Build sliding windows with padding so we have a window for each bin
     win = 2 * train + 2 * guard + 1
     if win <= 1:
@@ -451,6 +756,89 @@ def cfar_os_mask(psd_db: np.ndarray, train: int, guard: int, quantile: float, al
 # Detection & PSD
 # ------------------------------
 
+@functools.lru_cache(maxsize=4)
+def _hann(n: int) -> Tuple[np.ndarray, float]:
+    """Hann window (float32) plus its sum of squares, cached per size.
+
+    The sum of squares is the normalization term for a properly scaled Welch
+    estimate; caching both means repeated estimator construction (e.g. one
+    per sweep configuration) never re-allocates the window.
+    """
+    w = np.hanning(n).astype(np.float32)
+    return w, float(np.sum(w * w))
+
+
+if HAVE_NUMBA:
+
+    @numba.njit(cache=True, boundscheck=False)
+    def _walk_segments(above: np.ndarray, guard_bins: int, min_width: int):
+        """Scalar run-length walk over the detection mask, JIT-compiled.
+
+        Same semantics as the NumPy edge-merge path: runs separated by gaps
+        <= guard_bins merge; ends are exclusive at the last above-threshold
+        bin. Note that this matches the in-tree vectorized walk, not the
+        pre-vectorization loop (which kept trailing gap bins inside the
+        segment — see the semantics note in detect_segments); results must
+        not depend on whether numba is installed. Returns (starts, ends)
+        index arrays.
+        """
+        n = above.size
+        starts = np.empty(n, dtype=np.int64)
+        ends = np.empty(n, dtype=np.int64)
+        count = 0
+        i = 0
+        while i < n:
+            if above[i]:
+                start = i
+                end = i + 1
+                gap = 0
+                j = i + 1
+                while j < n:
+                    if above[j]:
+                        end = j + 1
+                        gap = 0
+                    else:
+                        gap += 1
+                        if gap > guard_bins:
+                            break
+                    j += 1
+                if end - start >= min_width:
+                    starts[count] = start
+                    ends[count] = end
+                    count += 1
+                i = j + 1
+            else:
+                i += 1
+        return starts[:count], ends[:count]
+
+    @functools.lru_cache(maxsize=4)
+    def make_psd_tail_kernel(n_avg: int, fft_size: int, samp_rate: float):
+        """Build a fused |X|^2 -> mean -> 10*log10 kernel specialized for one
+        (n_avg, fft_size, samp_rate) configuration.
+
+        The shape constants and normalization scale are captured by the njit
+        closure, so Numba treats them as compile-time literals: the averaging
+        loop unrolls and the scale folds into the store. One pass over the
+        FFT output instead of three memory-bound array sweeps.
+        """
+        scale = 1.0 / (n_avg * fft_size * samp_rate)
+
+        @numba.njit(parallel=True, fastmath=True, cache=True)
+        def kern(x_re: np.ndarray, x_im: np.ndarray, out: np.ndarray):
+            for k in numba.prange(fft_size):
+                acc = 0.0
+                for j in range(n_avg):
+                    r = x_re[j, k]
+                    im = x_im[j, k]
+                    acc += r * r + im * im
+                v = acc * scale
+                if v < 1e-20:
+                    v = 1e-20
+                out[k] = 10.0 * math.log10(v)
+
+        return kern
+
+
 def detect_segments(
     freqs_hz: np.ndarray,
     psd_db: np.ndarray,
@@ -462,9 +850,11 @@ def detect_segments(
     cfar_guard: int = 4,
     cfar_quantile: float = 0.75,
     cfar_alpha_db: Optional[float] = None,
+    psd_lin: Optional[np.ndarray] = None,
 ) -> Tuple[List[Segment], np.ndarray, np.ndarray]:
     """Detect contiguous energy segments.
     If cfar_mode != 'off', use OS-CFAR to produce the detection mask. Otherwise use a global robust noise floor.
+    psd_lin, when given, feeds the CFAR threshold directly without re-exponentiating.
     Returns (segments, above_mask, noise_est_db_per_bin).
     """
     psd_db = np.asarray(psd_db).astype(np.float64)
@@ -475,7 +865,9 @@ def detect_segments(
 
     if cfar_mode and cfar_mode.lower() != "off":
         alpha_db = float(cfar_alpha_db if cfar_alpha_db is not None else thresh_db)
-        above, noise_local_db = cfar_os_mask(psd_db, cfar_train, cfar_guard, cfar_quantile, alpha_db)
+        above, noise_local_db = cfar_os_mask(
+            psd_db, cfar_train, cfar_guard, cfar_quantile, alpha_db, psd_lin=psd_lin
+        )
         noise_for_snr_db = noise_local_db
     else:
         # Global robust threshold
@@ -484,87 +876,157 @@ def detect_segments(
         above = psd_db > dynamic
         noise_for_snr_db = np.full(N, nf, dtype=np.float64)
 
-    # Merge small gaps (guard_bins) and form contiguous segments
+    # Segment-end semantics (all three walks below): runs separated by gaps
+    # of <= guard_bins bins merge, and a segment's end is exclusive at its
+    # last above-threshold bin. The pre-vectorization walk instead kept up
+    # to guard_bins trailing below-threshold bins inside the segment, so a
+    # gap-padded run could clear min_width_bins and f_high_hz/f_center_hz
+    # could land on gap bins. The trimmed ends are deliberate: guard bins
+    # exist to bridge dropouts inside a signal, not to extend its recorded
+    # edges into noise, so widths are no longer inflated by trailing gap
+    # and reported frequency bounds always sit on detected energy.
+    if HAVE_EXT:
+        # Hand-compiled kernel (see the sdrwatch_ext note near the imports);
+        # same (starts, ends) contract as the paths below.
+        starts, ends = sdrwatch_ext.walk_segments(
+            np.ascontiguousarray(above, dtype=np.uint8), int(guard_bins), int(min_width_bins)
+        )
+    elif HAVE_NUMBA:
+        # Native scalar walk (JIT-compiled once, cached on disk).
+        starts, ends = _walk_segments(
+            np.ascontiguousarray(above), int(guard_bins), int(min_width_bins)
+        )
+    else:
+        # Vectorized run-length scan: find run edges with diff/nonzero, merge
+        # runs separated by gaps <= guard_bins, then filter by minimum width.
+        # Only the (few) surviving segments fall back to Python-level work.
+        edges = np.diff(np.concatenate(([0], above.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)  # exclusive
+
+        if guard_bins > 0 and starts.size > 1:
+            gaps = starts[1:] - ends[:-1]
+            keep = gaps > guard_bins  # run boundaries that survive gap merging
+            starts = np.concatenate(([starts[0]], starts[1:][keep]))
+            ends = np.concatenate((ends[:-1][keep], [ends[-1]]))
+
+        wide = (ends - starts) >= min_width_bins
+        starts = starts[wide]
+        ends = ends[wide]
+
     segs: List[Segment] = []
-    i = 0
-    while i < N:
-        if above[i]:
-            start_i = i
-            j = i + 1
-            gap = 0
-            while j < N and (above[j] or gap < guard_bins):
-                if above[j]:
-                    gap = 0
-                else:
-                    gap += 1
-                j += 1
-            end_i = j  # exclusive
-            # Ensure minimum width
-            if (end_i - start_i) >= min_width_bins:
-                sl = slice(start_i, end_i)
-                peak_idx_local = int(np.argmax(psd_db[sl]))
-                peak_idx = start_i + peak_idx_local
-                peak_db = float(psd_db[peak_idx])
-                # Representative noise for SNR = local noise at the peak bin
-                noise_db = float(noise_for_snr_db[peak_idx])
-                snr_db = float(peak_db - noise_db)
-                # freq bounds (use bin edges assuming uniform spacing)
-                f_low = float(freqs_hz[start_i])
-                f_high = float(freqs_hz[end_i - 1])
-                f_center = float(freqs_hz[(start_i + end_i) // 2])
-                segs.append(
-                    Segment(
-                        f_low_hz=int(round(f_low)),
-                        f_high_hz=int(round(f_high)),
-                        f_center_hz=int(round(f_center)),
-                        peak_db=peak_db,
-                        noise_db=noise_db,
-                        snr_db=snr_db,
-                    )
+    if starts.size:
+        # Gather per-segment fields in bulk (SoA) before building the few
+        # surviving Segment objects; only the peak argmax stays per-segment.
+        f_low_arr = np.rint(freqs_hz[starts]).astype(np.int64).tolist()
+        f_high_arr = np.rint(freqs_hz[ends - 1]).astype(np.int64).tolist()
+        f_center_arr = np.rint(freqs_hz[(starts + ends) // 2]).astype(np.int64).tolist()
+        for k, (start_i, end_i) in enumerate(zip(starts.tolist(), ends.tolist())):
+            peak_idx = start_i + psd_db[start_i:end_i].argmax()
+            # .item() yields native Python floats in one step, skipping the
+            # 0-d array + float() round trip per field.
+            peak_db = psd_db.item(peak_idx)
+            # Representative noise for SNR = local noise at the peak bin
+            noise_db = noise_for_snr_db.item(peak_idx)
+            segs.append(
+                Segment(
+                    f_low_hz=f_low_arr[k],
+                    f_high_hz=f_high_arr[k],
+                    f_center_hz=f_center_arr[k],
+                    peak_db=peak_db,
+                    noise_db=noise_db,
+                    snr_db=peak_db - noise_db,
                 )
-            i = j
-        else:
-            i += 1
+            )
 
     return segs, above, noise_for_snr_db
 
 
-def compute_psd_db(samples: np.ndarray, samp_rate: float, fft_size: int, avg: int) -> Tuple[np.ndarray, np.ndarray]:
-    if HAVE_SCIPY:
-        # Welch PSD over 'avg' segments
-        nperseg = fft_size
-        noverlap = 0
-        freqs, psd = welch(samples, fs=samp_rate, nperseg=nperseg, noverlap=noverlap, return_onesided=False, scaling="density")
-        # Welch returns frequencies in ascending order; we want baseband centered
-        # Convert to centered, consistent with fftshift convention
-        order = np.argsort(freqs)
-        freqs = freqs[order]
-        psd = psd[order]
-        # shift to baseband (-Fs/2..+Fs/2)
-        mid = len(freqs) // 2
-        freqs = np.concatenate((freqs[mid:], freqs[:mid]))
-        psd = np.concatenate((psd[mid:], psd[:mid]))
-    else:
-        # Simple averaged periodogram
-        seg = fft_size
-        windows = []
-        for i in range(avg):
-            start = i * seg
-            x = samples[start : start + seg]
-            if len(x) < seg:
-                break
-            X = np.fft.fftshift(np.fft.fft(x * np.hanning(seg), n=seg))
-            Pxx = (np.abs(X) ** 2) / (seg * samp_rate)
-            windows.append(Pxx)
-        if not windows:
-            X = np.fft.fftshift(np.fft.fft(samples[:fft_size] * np.hanning(fft_size), n=fft_size))
-            Pxx = (np.abs(X) ** 2) / (fft_size * samp_rate)
-            windows = [Pxx]
-        psd = np.mean(np.vstack(windows), axis=0)
-        freqs = np.linspace(-samp_rate / 2, samp_rate / 2, len(psd), endpoint=False)
+class PSDEstimator:
+    """Reusable PSD estimator for a fixed (fft_size, samp_rate, avg).
+
+    The Hann window, baseband frequency axis, and averaging accumulator are
+    allocated once and reused for every sweep window, instead of rebuilding
+    them per call. With pyFFTW registered as the scipy.fft backend the Welch
+    path also reuses cached FFTW plans.
+    """
 
-    psd_db = db10(psd)
-    return freqs, psd_db
+    def __init__(self, fft_size: int, samp_rate: float, avg: int, use_gpu: bool = False):
+        self.fft_size = int(fft_size)
+        self.samp_rate = float(samp_rate)
+        self.avg = int(avg)
+        if use_gpu and not HAVE_CUPY:
+            raise RuntimeError("CuPy not available (required for --gpu)")
+        self.use_gpu = bool(use_gpu)
+        # Samples arrive as complex64; float32 is plenty for dB-scale detection
+        # and halves bandwidth through the window/accumulate/log chain. The
+        # frequency axis stays float64: bin spacing matters at RF offsets.
+        self.window, self.window_sum_sq = _hann(self.fft_size)
+        # Baseband bin frequencies, centered (-Fs/2 .. +Fs/2). The natural->
+        # centered reorder index is computed once here; per-window code never
+        # calls fftshift/argsort (each of which copies or sorts a full array).
+        base = np.fft.fftfreq(self.fft_size, 1.0 / self.samp_rate)
+        self._order = np.argsort(base)
+        self.freqs = base[self._order]
+        if self.use_gpu:
+            # Device-resident window and reorder index, uploaded once.
+            self._window_gpu = cp.asarray(self.window)
+            self._order_gpu = cp.asarray(self._order)
+
+    def _call_gpu(self, samples: np.ndarray) -> np.ndarray:
+        """All 'avg' segments as one batched cuFFT; only psd_db (f32) comes back."""
+        seg = self.fft_size
+        n_seg = max(1, min(self.avg, samples.size // seg))
+        batch = cp.asarray(samples[: n_seg * seg]).reshape(n_seg, seg)
+        X = cp.fft.fft(batch * self._window_gpu, axis=1)
+        pxx = (cp.square(X.real) + cp.square(X.imag)).mean(axis=0) / (seg * self.samp_rate)
+        psd_db = 10.0 * cp.log10(cp.maximum(pxx[self._order_gpu], 1e-20))
+        return cp.asnumpy(psd_db).astype(np.float32, copy=False)
+
+    def __call__(self, samples: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        """Return (freqs, psd_lin, psd_db).
+
+        psd_lin is the linear-power PSD when the compute path produces it for
+        free (Welch, plain periodogram) so CFAR never has to re-exponentiate
+        psd_db; it is None on the GPU and fused-Numba paths, which only
+        materialize dB.
+        """
+        if self.use_gpu:
+            return self.freqs, None, self._call_gpu(samples)
+        if HAVE_SCIPY:
+            # Welch PSD over 'avg' segments. welch returns bins in natural
+            # fftfreq order; one precomputed reorder maps to centered order.
+            freqs, psd = welch(
+                samples,
+                fs=self.samp_rate,
+                nperseg=self.fft_size,
+                noverlap=0,
+                return_onesided=False,
+                scaling="density",
+            )
+            psd = psd[self._order].astype(np.float32, copy=False)
+        else:
+            # Averaged periodogram as one batched FFT: a zero-copy reshape
+            # view of the sample buffer replaces the per-segment Python loop.
+            seg = self.fft_size
+            n_seg = samples.size // seg
+            if n_seg == 0:
+                # Short read: zero-pad a single segment (matches np.fft.fft's
+                # n=seg behaviour in the old loop).
+                x = np.zeros(seg, dtype=np.complex64)
+                x[: samples.size] = samples
+                segs2d = x.reshape(1, seg)
+            else:
+                segs2d = samples[: min(self.avg, n_seg) * seg].reshape(-1, seg)
+            X = np.fft.fft(segs2d * self.window, axis=1)
+            if HAVE_NUMBA:
+                kern = make_psd_tail_kernel(segs2d.shape[0], seg, self.samp_rate)
+                out = np.empty(seg, dtype=np.float32)
+                kern(X.real, X.imag, out)
+                return self.freqs, None, out[self._order]
+            pxx = (np.square(X.real) + np.square(X.imag)).mean(axis=0).astype(np.float32)
+            psd = pxx[self._order] / np.float32(seg * self.samp_rate)
+        return self.freqs, psd, db10(psd)
 
 
 # ------------------------------
@@ -582,13 +1044,29 @@ def maybe_notify(title: str, body: str, enabled: bool):
         pass
 
 
+# Append handle for the --jsonl sink, opened once per process instead of an
+# open/write/close syscall trio per record.
+_jsonl_fp = None
+
+
+def _jsonl_handle(path: str):
+    global _jsonl_fp
+    if _jsonl_fp is None:
+        _jsonl_fp = open(path, "ab", buffering=1 << 16)
+        atexit.register(_jsonl_fp.close)
+    return _jsonl_fp
+
+
 def maybe_emit_jsonl(path: Optional[str], record: dict):
     if not path:
         return
     try:
-        import json
-        with open(path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record) + "\n")
+        fp = _jsonl_handle(path)
+        if HAVE_ORJSON:
+            fp.write(orjson.dumps(record))
+        else:
+            fp.write(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+        fp.write(b"\n")
     except Exception:
         pass
 
@@ -623,7 +1101,7 @@ def _parse_duration_to_seconds(text: Optional[str]) -> Optional[float]:
         raise ValueError(f"Invalid duration string: {text}")
 
 
-def _do_one_sweep(args, store: Store, bandplan: Bandplan, src) -> int:
+def _do_one_sweep(args, store: Store, bandplan: Bandplan, src, psd_est: PSDEstimator) -> int:
     """Perform a single full sweep across [start, stop] inclusive, returning the scan_id."""
     meta = dict(
         t_start_utc=utc_now_str(),
@@ -638,75 +1116,100 @@ def _do_one_sweep(args, store: Store, bandplan: Bandplan, src) -> int:
     )
     scan_id = store.start_scan(meta)
 
-    try:
-        center = args.start
-        while center <= args.stop:
-            src.tune(center)
-            nsamps = int(args.fft * args.avg)
-            # Discard a small warmup buffer to allow tuner/AGC to settle
-            _ = src.read(int(args.fft))
-            samples = src.read(nsamps)
-            baseband_f, psd_db = compute_psd_db(samples, args.samp_rate, args.fft, args.avg)
-            # Translate baseband freqs to RF
-            rf_freqs = baseband_f + center
-
-            # Detect segments
-            segs, occ_mask_cfar, _noise_local_db = detect_segments(
-                rf_freqs,
-                psd_db,
-                thresh_db=args.threshold_db,
-                guard_bins=args.guard_bins,
-                min_width_bins=args.min_width_bins,
-                cfar_mode=args.cfar,
-                cfar_train=args.cfar_train,
-                cfar_guard=args.cfar_guard,
-                cfar_quantile=args.cfar_quantile,
-                cfar_alpha_db=args.cfar_alpha_db,
-            )
+    def _process(samples: np.ndarray, center: float) -> None:
+        """PSD, detection and DB writes for one window (runs on the worker)."""
+        baseband_f, psd_lin, psd_db = psd_est(samples)
+        # Translate baseband freqs to RF
+        rf_freqs = baseband_f + center
+
+        # Detect segments
+        segs, above_mask, _noise_local_db = detect_segments(
+            rf_freqs,
+            psd_db,
+            thresh_db=args.threshold_db,
+            guard_bins=args.guard_bins,
+            min_width_bins=args.min_width_bins,
+            cfar_mode=args.cfar,
+            cfar_train=args.cfar_train,
+            cfar_guard=args.cfar_guard,
+            cfar_quantile=args.cfar_quantile,
+            cfar_alpha_db=args.cfar_alpha_db,
+            psd_lin=psd_lin,
+        )
+
+        # Occupancy mask per bin for baseline update: detect_segments already
+        # produced the thresholded mask for both the CFAR and the global
+        # noise-floor case — no need to recompute the floor here.
+        occupied_mask = above_mask
 
-            # Occupancy mask per bin for baseline update
-            noise_db = robust_noise_floor_db(psd_db)
-            dynamic = noise_db + args.threshold_db
-            occupied_mask = occ_mask_cfar if (args.cfar and args.cfar != 'off') else (psd_db > dynamic)
-
-            # --- begin per-window batched DB writes ---
-            store.begin()
-
-            store.update_baseline(rf_freqs, psd_db, occupied_mask)
-
-            # Persist detections and possibly alert on "new" bins
-            for seg in segs:
-                svc, reg, note = bandplan.lookup(seg.f_center_hz)
-                store.add_detection(scan_id, seg, svc, reg, note)
-
-                # Decide "new to baseline": occupancy EMA below threshold
-                occ = store.baseline_occ(seg.f_center_hz)
-                is_new = (occ is not None and occ < args.new_ema_occ)
-
-                record = {
-                    "time_utc": utc_now_str(),
-                    "f_center_hz": seg.f_center_hz,
-                    "f_low_hz": seg.f_low_hz,
-                    "f_high_hz": seg.f_high_hz,
-                    "peak_db": seg.peak_db,
-                    "noise_db": seg.noise_db,
-                    "snr_db": seg.snr_db,
-                    "service": svc,
-                    "region": reg,
-                    "notes": note,
-                    "is_new": bool(is_new),
-                }
-                maybe_emit_jsonl(args.jsonl, record)
-                if is_new:
-                    body = f"{seg.f_center_hz/1e6:.6f} MHz; SNR {seg.snr_db:.1f} dB; {svc or 'Unknown'} {reg or ''}"
-                    maybe_notify("SDRWatch: New signal", body, args.notify)
-
-            # commit batched writes for this window
-            store.commit()
-
-            # Advance center frequency
-            center += args.step
+        # --- begin per-window batched DB writes ---
+        store.begin()
 
+        store.update_baseline(rf_freqs, psd_db, occupied_mask)
+
+        # Persist detections and possibly alert on "new" bins. One vectorized
+        # bandplan lookup covers every segment in the window.
+        det_rows: List[Tuple[Segment, str, str, str]] = []
+        services = bandplan.lookup_many(
+            np.fromiter((s.f_center_hz for s in segs), dtype=np.int64, count=len(segs))
+        )
+        occ_map = store.baseline_occ_many(s.f_center_hz for s in segs)
+        for seg, (svc, reg, note) in zip(segs, services):
+            det_rows.append((seg, svc, reg, note))
+
+            # Decide "new to baseline": occupancy EMA below threshold
+            occ = occ_map.get(seg.f_center_hz)
+            is_new = (occ is not None and occ < args.new_ema_occ)
+
+            record = {
+                "time_utc": utc_now_str(),
+                "f_center_hz": seg.f_center_hz,
+                "f_low_hz": seg.f_low_hz,
+                "f_high_hz": seg.f_high_hz,
+                "peak_db": seg.peak_db,
+                "noise_db": seg.noise_db,
+                "snr_db": seg.snr_db,
+                "service": svc,
+                "region": reg,
+                "notes": note,
+                "is_new": bool(is_new),
+            }
+            maybe_emit_jsonl(args.jsonl, record)
+            if is_new:
+                body = f"{seg.f_center_hz/1e6:.6f} MHz; SNR {seg.snr_db:.1f} dB; {svc or 'Unknown'} {reg or ''}"
+                maybe_notify("SDRWatch: New signal", body, args.notify)
+
+        store.add_detections(scan_id, det_rows)
+
+        # commit batched writes for this window
+        store.commit()
+
+    nsamps = int(args.fft * args.avg)
+    # Double-buffered RX: while the worker computes PSD/detections and writes
+    # the DB for window K, the main thread tunes and reads window K+1. Each
+    # buffer is reused only after its in-flight window has been processed.
+    bufs = (np.empty(nsamps, dtype=np.complex64), np.empty(nsamps, dtype=np.complex64))
+    warmup = np.empty(int(args.fft), dtype=np.complex64)
+    futures: List[Optional[Future]] = [None, None]
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            idx = 0
+            center = args.start
+            while center <= args.stop:
+                src.tune(center)
+                # Discard a small warmup buffer to allow tuner/AGC to settle
+                src.read_into(warmup, warmup.size)
+                if futures[idx] is not None:
+                    futures[idx].result()
+                src.read_into(bufs[idx], nsamps)
+                futures[idx] = pool.submit(_process, bufs[idx], center)
+                idx ^= 1
+                # Advance center frequency
+                center += args.step
+            for fut in futures:
+                if fut is not None:
+                    fut.result()
     finally:
         # End scan (always set end time)
         store.end_scan(scan_id, utc_now_str())
@@ -735,6 +1238,19 @@ def run(args):
     else:
         src = SDRSource(driver=args.driver, samp_rate=args.samp_rate, gain=args.gain, soapy_args=soapy_args_dict)
 
+    psd_est = PSDEstimator(args.fft, args.samp_rate, args.avg, use_gpu=args.gpu)
+
+    if HAVE_NUMBA:
+        # Pay the JIT compile cost now rather than inside the first window,
+        # specializing the PSD tail for this sweep's exact configuration
+        _walk_segments(np.zeros(8, dtype=np.bool_), 1, 2)
+        kern = make_psd_tail_kernel(int(args.avg), int(args.fft), float(args.samp_rate))
+        kern(
+            np.zeros((int(args.avg), int(args.fft))),
+            np.zeros((int(args.avg), int(args.fft))),
+            np.empty(int(args.fft), dtype=np.float32),
+        )
+
     # Determine termination policy
     duration_s = _parse_duration_to_seconds(args.duration)
     start_time = time.time()
@@ -760,7 +1276,7 @@ def run(args):
             if duration_s is not None and (time.time() - start_time) >= duration_s:
                 break
 
-            _do_one_sweep(args, store, bandplan, src)
+            _do_one_sweep(args, store, bandplan, src, psd_est)
 
             # After each sweep, respect duration again
             if duration_s is not None and (time.time() - start_time) >= duration_s:
@@ -798,6 +1314,7 @@ def parse_args():
     p.add_argument("--samp-rate", type=float, default=2.4e6, help="Sample rate [Hz]")
     p.add_argument("--fft", type=int, default=4096, help="FFT size (per Welch segment)")
     p.add_argument("--avg", type=int, default=8, help="Averaging factor (segments per PSD)")
+    p.add_argument("--gpu", action="store_true", help="Compute PSDs on the GPU via CuPy (batched cuFFT); requires cupy")
 
     p.add_argument("--driver", type=str, default="rtlsdr", help="Soapy driver key (e.g., rtlsdr, hackrf, airspy, etc.) or 'rtlsdr_native' for direct librtlsdr")
     p.add_argument("--soapy-args", type=str, default=None, help="Comma-separated Soapy device args (e.g., 'serial=00000001,index=0')")